@@ -7,12 +7,14 @@ Each command module provides:
 - execute(): Function to execute the command
 """
 
+from . import api
 from . import discussion
 from . import issue
 from . import sub_issue
 
 # Registry of all command modules
 COMMAND_MODULES = {
+    "api": api,
     "discussion": discussion,
     "issue": issue,
     "sub-issue": sub_issue,
@@ -55,9 +57,12 @@ def execute_command(
     return module.execute(args, owner, repo, pat)
 
 
-def get_all_command_actions() -> list[str]:
+# COMMAND_MODULES is static, so the action list is computed once at import
+_ALL_ACTIONS: tuple[str, ...] = tuple(
+    action for module in COMMAND_MODULES.values() for action in module.ACTIONS
+)
+
+
+def get_all_command_actions() -> tuple[str, ...]:
     """Get all actions from all command modules."""
-    actions = []
-    for module in COMMAND_MODULES.values():
-        actions.extend(module.ACTIONS)
-    return actions
+    return _ALL_ACTIONS
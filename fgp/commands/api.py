@@ -0,0 +1,93 @@
+"""
+API command module.
+
+Serves plain `gh api <endpoint>` reads in-process over the pooled REST
+client instead of spawning gh for each call. Anything with extra arguments
+(method, fields, headers, --jq, --paginate, ...) or {placeholders} falls
+through to gh CLI (returns None).
+"""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Final
+from urllib.error import HTTPError, URLError
+
+from ..core.http import GITHUB_API_HEADERS, request
+from ..core.jsonutil import JSONDecodeError, dumps, loads
+
+# Actions this module provides (none: `gh api` is not a policy action)
+ACTIONS = []
+
+# CLI command -> action mapping
+CLI_ACTIONS: Final[Mapping[str, str | None]] = MappingProxyType({})
+
+_API_BASE_URL = "https://api.github.com/"
+
+
+def get_action(subcmd: str | None, args: list[str]) -> tuple[str | None, str | None]:
+    """Get action for api subcommand."""
+    return None, None
+
+
+def execute(args: list[str], owner: str, repo: str, pat: str) -> dict | None:
+    """
+    Execute api command.
+
+    Returns None to fall through to gh CLI for anything but a bare GET.
+    """
+    if len(args) != 1:
+        return None
+
+    endpoint = args[0]
+    if (
+        endpoint.startswith("-")
+        or "{" in endpoint
+        or "://" in endpoint
+        or endpoint.lstrip("/") == "graphql"
+    ):
+        return None
+
+    try:
+        _, headers, body = request(
+            "GET", _API_BASE_URL + endpoint.lstrip("/"),
+            headers={**GITHUB_API_HEADERS, "Authorization": f"Bearer {pat}"},
+            timeout=60,
+        )
+    except HTTPError as e:
+        error_body = e.read()
+        message = _error_message(error_body)
+        stderr = f"gh: {message} (HTTP {e.code})\n" if message else f"gh: HTTP {e.code}\n"
+        return {
+            "exit_code": 1,
+            "stdout": _format_body(error_body, e.headers.get("Content-Type", "")),
+            "stderr": stderr,
+        }
+    except URLError:
+        return None  # Let gh report the connection problem its own way
+
+    return {
+        "exit_code": 0,
+        "stdout": _format_body(body, headers.get("Content-Type", "")),
+        "stderr": "",
+    }
+
+
+def _format_body(body: bytes, content_type: str) -> str:
+    """Render a response body the way `gh api` prints it on a terminal."""
+    if not body:
+        return ""
+    if "json" in content_type:
+        try:
+            return dumps(loads(body), indent=True).decode("utf-8") + "\n"
+        except JSONDecodeError:
+            pass
+    return body.decode("utf-8", errors="replace")
+
+
+def _error_message(body: bytes) -> str | None:
+    """Extract GitHub's error message from an error response body."""
+    try:
+        data = loads(body)
+    except JSONDecodeError:
+        return None
+    return data.get("message") if isinstance(data, dict) else None
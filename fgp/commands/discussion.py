@@ -5,7 +5,14 @@ Provides GitHub Discussions support via GraphQL API.
 gh CLI doesn't have `gh discussion` command, so this is a custom implementation.
 """
 
-from ..core.graphql import execute_graphql, get_repository_id
+import io
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Final
+
+from ..core.args import parse_flags
+from ..core.cache import TTLCache
+from ..core.graphql import execute_graphql, get_repository_id, remember_repository_id
 
 # Actions this module provides (Layer 1 only)
 ACTIONS = [
@@ -25,8 +32,11 @@ ACTIONS = [
     "discussions:poll_vote",
 ]
 
+# Discussion and category node IDs; repository IDs live in core.graphql's cache
+_ID_CACHE = TTLCache(maxsize=4096, ttl=3600)
+
 # CLI command -> action mapping
-CLI_ACTIONS = {
+CLI_ACTIONS: Final[Mapping[str, str | None]] = MappingProxyType({
     "list": "discussions:list",
     "view": "discussions:get",
     "create": "discussions:create",
@@ -38,7 +48,7 @@ CLI_ACTIONS = {
     "answer": "discussions:answer",
     "unanswer": "discussions:unanswer",
     "poll": None,  # Determined by subcommand
-}
+})
 
 
 def get_action(subcmd: str | None, args: list[str]) -> tuple[str | None, str | None]:
@@ -68,8 +78,7 @@ def get_action(subcmd: str | None, args: list[str]) -> tuple[str | None, str | N
             return "discussions:poll_vote", None
         return None, None
 
-    action = CLI_ACTIONS.get(subcmd)
-    return (action, None) if action else (None, None)
+    return CLI_ACTIONS.get(subcmd), None
 
 
 def execute(args: list[str], owner: str, repo: str, pat: str) -> dict:
@@ -78,90 +87,151 @@ def execute(args: list[str], owner: str, repo: str, pat: str) -> dict:
         raise ValueError("discussion subcommand required")
 
     subcmd = args[0]
-    rest = args[1:]
+    handler = _DISPATCH.get(subcmd)
+    if handler is None:
+        raise ValueError(f"Unknown discussion subcommand: {subcmd}")
+    return handler(args[1:], owner, repo, pat)
 
-    if subcmd == "list":
-        return _list_discussions(owner, repo, pat)
 
-    elif subcmd == "view":
-        if not rest:
-            raise ValueError("discussion number required")
-        number = int(rest[0])
-        return _view_discussion(owner, repo, number, pat)
+# =============================================================================
+# Subcommand Dispatch
+# =============================================================================
 
-    elif subcmd == "create":
-        title, body, category = _parse_create_args(rest)
-        return _create_discussion(owner, repo, title, body, category, pat)
+def _require_number(rest: list[str]) -> int:
+    """Get the discussion number from the first positional arg."""
+    if not rest:
+        raise ValueError("discussion number required")
+    return int(rest[0])
 
-    elif subcmd == "edit":
-        if not rest:
-            raise ValueError("discussion number required")
-        number = int(rest[0])
-        title, body = _parse_edit_args(rest[1:])
-        return _update_discussion(owner, repo, number, title, body, pat)
 
-    elif subcmd == "close":
-        if not rest:
-            raise ValueError("discussion number required")
-        number = int(rest[0])
-        return _close_discussion(owner, repo, number, pat)
+def _require_comment_id(rest: list[str]) -> str:
+    """Get the comment ID from the first positional arg."""
+    if not rest:
+        raise ValueError("comment_id required")
+    return rest[0]
 
-    elif subcmd == "reopen":
-        if not rest:
-            raise ValueError("discussion number required")
-        number = int(rest[0])
-        return _reopen_discussion(owner, repo, number, pat)
 
-    elif subcmd == "delete":
-        if not rest:
-            raise ValueError("discussion number required")
-        number = int(rest[0])
-        return _delete_discussion(owner, repo, number, pat)
+def _cmd_list(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    return _list_discussions(owner, repo, pat)
 
-    elif subcmd == "comment":
-        return _handle_comment(rest, owner, repo, pat)
 
-    elif subcmd == "answer":
-        if not rest:
-            raise ValueError("comment_id required")
-        comment_id = rest[0]
-        return _mark_answer(comment_id, pat)
+def _cmd_view(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    positional, comments, with_body = _parse_view_args(rest)
+    return _view_discussion(owner, repo, _require_number(positional), pat, comments, with_body)
 
-    elif subcmd == "unanswer":
-        if not rest:
-            raise ValueError("comment_id required")
-        comment_id = rest[0]
-        return _unmark_answer(comment_id, pat)
 
-    elif subcmd == "poll":
-        return _handle_poll(rest, pat)
+def _cmd_create(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    title, body, category = _parse_create_args(rest)
+    return _create_discussion(owner, repo, title, body, category, pat)
+
+
+def _cmd_edit(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    number = _require_number(rest)
+    title, body = _parse_edit_args(rest[1:])
+    return _update_discussion(owner, repo, number, title, body, pat)
+
+
+def _cmd_close(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    return _close_discussion(owner, repo, _require_number(rest), pat)
+
+
+def _cmd_reopen(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    return _reopen_discussion(owner, repo, _require_number(rest), pat)
+
+
+def _cmd_delete(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    return _delete_discussion(owner, repo, _require_number(rest), pat)
+
+
+def _cmd_comment(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    return _handle_comment(rest, owner, repo, pat)
+
+
+def _cmd_answer(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    return _mark_answer(_require_comment_id(rest), pat)
 
-    else:
-        raise ValueError(f"Unknown discussion subcommand: {subcmd}")
+
+def _cmd_unanswer(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    return _unmark_answer(_require_comment_id(rest), pat)
+
+
+def _cmd_poll(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    return _handle_poll(rest, pat)
+
+
+_DISPATCH = {
+    "list": _cmd_list,
+    "view": _cmd_view,
+    "create": _cmd_create,
+    "edit": _cmd_edit,
+    "close": _cmd_close,
+    "reopen": _cmd_reopen,
+    "delete": _cmd_delete,
+    "comment": _cmd_comment,
+    "answer": _cmd_answer,
+    "unanswer": _cmd_unanswer,
+    "poll": _cmd_poll,
+}
 
 
 # =============================================================================
 # Argument Parsing
 # =============================================================================
 
+_TITLE_BODY_SPEC = {
+    "--title": ("title", True),
+    "-t": ("title", True),
+    "--body": ("body", True),
+    "-b": ("body", True),
+}
+_CREATE_SPEC = {
+    **_TITLE_BODY_SPEC,
+    "--category": ("category", True),
+    "-c": ("category", True),
+}
+_BODY_SPEC = {
+    "--body": ("body", True),
+    "-b": ("body", True),
+}
+_ADD_COMMENT_SPEC = {
+    **_BODY_SPEC,
+    "--reply-to": ("reply_to", True),
+}
+
+
+_VIEW_SPEC = {
+    "--comments": ("comments", True),
+    "--no-body": ("no_body", False),
+}
+
+# GitHub caps connection page size at 100
+_MAX_COMMENTS = 100
+_DEFAULT_COMMENTS = 50
+
+
+def _parse_view_args(args: list[str]) -> tuple[list[str], int, bool]:
+    """
+    Parse --comments and --no-body from args.
+
+    Returns (positional_args, comments, with_body).
+    """
+    values, positional = parse_flags(args, _VIEW_SPEC)
+
+    comments = _DEFAULT_COMMENTS
+    if "comments" in values:
+        comments = int(values["comments"])
+        if not 0 <= comments <= _MAX_COMMENTS:
+            raise ValueError(f"--comments must be between 0 and {_MAX_COMMENTS}")
+
+    return positional, comments, not values.get("no_body", False)
+
+
 def _parse_create_args(args: list[str]) -> tuple[str, str, str]:
     """Parse --title, --body, --category from args."""
-    title = None
-    body = None
-    category = None
-    i = 0
-    while i < len(args):
-        if args[i] in ["--title", "-t"] and i + 1 < len(args):
-            title = args[i + 1]
-            i += 2
-        elif args[i] in ["--body", "-b"] and i + 1 < len(args):
-            body = args[i + 1]
-            i += 2
-        elif args[i] in ["--category", "-c"] and i + 1 < len(args):
-            category = args[i + 1]
-            i += 2
-        else:
-            i += 1
+    values, _ = parse_flags(args, _CREATE_SPEC)
+    title = values.get("title")
+    body = values.get("body")
+    category = values.get("category")
 
     if not title:
         raise ValueError("--title is required")
@@ -175,18 +245,9 @@ def _parse_create_args(args: list[str]) -> tuple[str, str, str]:
 
 def _parse_edit_args(args: list[str]) -> tuple[str | None, str | None]:
     """Parse --title, --body from args."""
-    title = None
-    body = None
-    i = 0
-    while i < len(args):
-        if args[i] in ["--title", "-t"] and i + 1 < len(args):
-            title = args[i + 1]
-            i += 2
-        elif args[i] in ["--body", "-b"] and i + 1 < len(args):
-            body = args[i + 1]
-            i += 2
-        else:
-            i += 1
+    values, _ = parse_flags(args, _TITLE_BODY_SPEC)
+    title = values.get("title")
+    body = values.get("body")
 
     if not title and not body:
         raise ValueError("--title or --body is required")
@@ -222,14 +283,8 @@ def _handle_comment(args: list[str], owner: str, repo: str, pat: str) -> dict:
 
 def _parse_comment_body(args: list[str]) -> str:
     """Parse --body from args."""
-    body = None
-    i = 0
-    while i < len(args):
-        if args[i] in ["--body", "-b"] and i + 1 < len(args):
-            body = args[i + 1]
-            i += 2
-        else:
-            i += 1
+    values, _ = parse_flags(args, _BODY_SPEC)
+    body = values.get("body")
 
     if not body:
         raise ValueError("--body is required")
@@ -238,181 +293,330 @@ def _parse_comment_body(args: list[str]) -> str:
 
 def _parse_add_comment_args(args: list[str]) -> tuple[str, str | None]:
     """Parse --body and --reply-to from args."""
-    body = None
-    reply_to = None
-    i = 0
-    while i < len(args):
-        if args[i] in ["--body", "-b"] and i + 1 < len(args):
-            body = args[i + 1]
-            i += 2
-        elif args[i] == "--reply-to" and i + 1 < len(args):
-            reply_to = args[i + 1]
-            i += 2
-        else:
-            i += 1
+    values, _ = parse_flags(args, _ADD_COMMENT_SPEC)
+    body = values.get("body")
 
     if not body:
         raise ValueError("--body is required")
-    return body, reply_to
+    return body, values.get("reply_to")
 
 
 # =============================================================================
-# GraphQL Operations
+# GraphQL Documents
 # =============================================================================
 
-def _get_discussion_category_id(owner: str, repo: str, category_name: str, pat: str) -> str:
-    """Get discussion category node ID."""
-    query = """
-    query($owner: String!, $repo: String!) {
-        repository(owner: $owner, name: $repo) {
-            discussionCategories(first: 100) {
+_Q_REPO_AND_CATEGORIES = """
+query($owner: String!, $repo: String!) {
+    repository(owner: $owner, name: $repo) {
+        id
+        discussionCategories(first: 100) {
+            nodes {
+                id
+                name
+                slug
+            }
+        }
+    }
+}
+"""
+
+_Q_DISCUSSION_ID = """
+query($owner: String!, $repo: String!, $number: Int!) {
+    repository(owner: $owner, name: $repo) {
+        discussion(number: $number) {
+            id
+        }
+    }
+}
+"""
+
+_Q_LIST_DISCUSSIONS = """
+query($owner: String!, $repo: String!) {
+    repository(owner: $owner, name: $repo) {
+        discussions(first: 30, orderBy: {field: CREATED_AT, direction: DESC}) {
+            nodes {
+                number
+                title
+                author { login }
+                createdAt
+                category { name }
+                comments { totalCount }
+            }
+        }
+    }
+}
+"""
+
+_Q_VIEW_DISCUSSION = """
+query($owner: String!, $repo: String!, $number: Int!, $first: Int!, $withBody: Boolean!) {
+    repository(owner: $owner, name: $repo) {
+        discussion(number: $number) {
+            number
+            title
+            body
+            author { login }
+            createdAt
+            category { name }
+            url
+            comments(first: $first) {
                 nodes {
                     id
-                    name
-                    slug
+                    author { login }
+                    body @include(if: $withBody)
+                    createdAt
                 }
             }
         }
     }
-    """
-    result = execute_graphql(query, {"owner": owner, "repo": repo}, pat)
-    categories = result["data"]["repository"]["discussionCategories"]["nodes"]
+}
+"""
+
+_M_CREATE_DISCUSSION = """
+mutation($repositoryId: ID!, $categoryId: ID!, $title: String!, $body: String!) {
+    createDiscussion(input: {repositoryId: $repositoryId, categoryId: $categoryId, title: $title, body: $body}) {
+        discussion {
+            number
+            url
+        }
+    }
+}
+"""
+
+_M_UPDATE_DISCUSSION = """
+mutation($discussionId: ID!, $title: String, $body: String) {
+    updateDiscussion(input: {discussionId: $discussionId, title: $title, body: $body}) {
+        discussion {
+            number
+            url
+        }
+    }
+}
+"""
+
+_M_ADD_COMMENT = """
+mutation($discussionId: ID!, $body: String!, $replyToId: ID) {
+    addDiscussionComment(input: {discussionId: $discussionId, body: $body, replyToId: $replyToId}) {
+        comment {
+            id
+            url
+        }
+    }
+}
+"""
+
+_M_UPDATE_COMMENT = """
+mutation($commentId: ID!, $body: String!) {
+    updateDiscussionComment(input: {commentId: $commentId, body: $body}) {
+        comment {
+            id
+            url
+        }
+    }
+}
+"""
+
+_M_CLOSE_DISCUSSION = """
+mutation($discussionId: ID!) {
+    closeDiscussion(input: {discussionId: $discussionId}) {
+        discussion {
+            number
+            url
+        }
+    }
+}
+"""
+
+_M_REOPEN_DISCUSSION = """
+mutation($discussionId: ID!) {
+    reopenDiscussion(input: {discussionId: $discussionId}) {
+        discussion {
+            number
+            url
+        }
+    }
+}
+"""
+
+_M_DELETE_DISCUSSION = """
+mutation($discussionId: ID!) {
+    deleteDiscussion(input: {id: $discussionId}) {
+        discussion {
+            number
+        }
+    }
+}
+"""
+
+_M_DELETE_COMMENT = """
+mutation($commentId: ID!) {
+    deleteDiscussionComment(input: {id: $commentId}) {
+        comment {
+            id
+        }
+    }
+}
+"""
+
+_M_MARK_ANSWER = """
+mutation($commentId: ID!) {
+    markDiscussionCommentAsAnswer(input: {id: $commentId}) {
+        discussion {
+            number
+            url
+        }
+    }
+}
+"""
+
+_M_UNMARK_ANSWER = """
+mutation($commentId: ID!) {
+    unmarkDiscussionCommentAsAnswer(input: {id: $commentId}) {
+        discussion {
+            number
+            url
+        }
+    }
+}
+"""
+
+_M_POLL_VOTE = """
+mutation($optionId: ID!) {
+    addDiscussionPollVote(input: {pollOptionId: $optionId}) {
+        pollOption {
+            id
+            option
+            totalVoteCount
+        }
+    }
+}
+"""
+
+
+# =============================================================================
+# GraphQL Operations
+# =============================================================================
+
+def _find_category_id(categories: list[dict], category_name: str) -> str:
+    """Find category node ID by name or slug (case-insensitive)."""
+    name_lower = category_name.lower()
     for cat in categories:
-        if cat["name"].lower() == category_name.lower() or cat["slug"].lower() == category_name.lower():
+        if cat["name"].lower() == name_lower or cat["slug"].lower() == name_lower:
             return cat["id"]
     available = [c["name"] for c in categories]
     raise ValueError(f"Category '{category_name}' not found. Available: {available}")
 
 
+def _get_repo_and_category_ids(
+    owner: str, repo: str, category_name: str, pat: str
+) -> tuple[str, str]:
+    """Get repository node ID and discussion category node ID in one request."""
+    category_key = ("category", owner.lower(), repo.lower(), category_name.lower())
+    category_id = _ID_CACHE.get(category_key)
+    if category_id is not None:
+        return get_repository_id(owner, repo, pat), category_id
+
+    result = execute_graphql(_Q_REPO_AND_CATEGORIES, {"owner": owner, "repo": repo}, pat)
+    repository = result["data"]["repository"]
+    categories = repository["discussionCategories"]["nodes"]
+    repo_id = repository["id"]
+    category_id = _find_category_id(categories, category_name)
+    remember_repository_id(owner, repo, repo_id)
+    _ID_CACHE[category_key] = category_id
+    return repo_id, category_id
+
+
 def _get_discussion_node_id(owner: str, repo: str, number: int, pat: str) -> str:
     """Get discussion node ID."""
-    query = """
-    query($owner: String!, $repo: String!, $number: Int!) {
-        repository(owner: $owner, name: $repo) {
-            discussion(number: $number) {
-                id
-            }
-        }
-    }
-    """
+    key = ("discussion", owner.lower(), repo.lower(), number)
+    cached = _ID_CACHE.get(key)
+    if cached is not None:
+        return cached
+
     result = execute_graphql(
-        query, {"owner": owner, "repo": repo, "number": number}, pat
+        _Q_DISCUSSION_ID, {"owner": owner, "repo": repo, "number": number}, pat
     )
     discussion = result["data"]["repository"]["discussion"]
     if not discussion:
         raise ValueError(f"Discussion #{number} not found")
+    _ID_CACHE[key] = discussion["id"]
     return discussion["id"]
 
 
 def _list_discussions(owner: str, repo: str, pat: str) -> dict:
     """List discussions."""
-    query = """
-    query($owner: String!, $repo: String!) {
-        repository(owner: $owner, name: $repo) {
-            discussions(first: 30, orderBy: {field: CREATED_AT, direction: DESC}) {
-                nodes {
-                    number
-                    title
-                    author { login }
-                    createdAt
-                    category { name }
-                    comments { totalCount }
-                }
-            }
-        }
-    }
-    """
-    result = execute_graphql(query, {"owner": owner, "repo": repo}, pat)
+    result = execute_graphql(_Q_LIST_DISCUSSIONS, {"owner": owner, "repo": repo}, pat)
     discussions = result["data"]["repository"]["discussions"]["nodes"]
 
-    lines = []
-    for d in discussions:
-        author = d["author"]["login"] if d["author"] else "ghost"
+    lines = [""] * len(discussions)
+    for i, d in enumerate(discussions):
+        author = a["login"] if (a := d["author"]) else "ghost"
         comments = d["comments"]["totalCount"]
-        category = d["category"]["name"] if d["category"] else ""
-        lines.append(f"#{d['number']}\t{d['title']}\t{author}\t{category}\t{comments} comments")
+        category = c["name"] if (c := d["category"]) else ""
+        lines[i] = f"#{d['number']}\t{d['title']}\t{author}\t{category}\t{comments} comments"
 
     return {"exit_code": 0, "stdout": "\n".join(lines), "stderr": ""}
 
 
-def _view_discussion(owner: str, repo: str, number: int, pat: str) -> dict:
-    """View discussion details."""
-    query = """
-    query($owner: String!, $repo: String!, $number: Int!) {
-        repository(owner: $owner, name: $repo) {
-            discussion(number: $number) {
-                number
-                title
-                body
-                author { login }
-                createdAt
-                category { name }
-                url
-                comments(first: 50) {
-                    nodes {
-                        id
-                        author { login }
-                        body
-                        createdAt
-                    }
-                }
-            }
-        }
-    }
+def _view_discussion(
+    owner: str, repo: str, number: int, pat: str,
+    comments: int = _DEFAULT_COMMENTS, with_body: bool = True
+) -> dict:
     """
-    result = execute_graphql(
-        query, {"owner": owner, "repo": repo, "number": number}, pat
-    )
+    View discussion details.
+
+    Only the first `comments` comments are fetched. Without with_body,
+    comment bodies are left out of the query, not just the output.
+    """
+    variables = {
+        "owner": owner,
+        "repo": repo,
+        "number": number,
+        "first": comments,
+        "withBody": with_body,
+    }
+    result = execute_graphql(_Q_VIEW_DISCUSSION, variables, pat)
     d = result["data"]["repository"]["discussion"]
     if not d:
         raise ValueError(f"Discussion #{number} not found")
 
-    author = d["author"]["login"] if d["author"] else "ghost"
-    lines = [
-        f"title:\t{d['title']}",
-        f"number:\t{d['number']}",
-        f"author:\t{author}",
-        f"category:\t{d['category']['name'] if d['category'] else ''}",
-        f"url:\t{d['url']}",
-        f"created:\t{d['createdAt']}",
-        "",
-        "--- BODY ---",
-        d["body"] or "(empty)",
-        "",
-        "--- COMMENTS ---",
-    ]
+    author = a["login"] if (a := d["author"]) else "ghost"
+    category = cat["name"] if (cat := d["category"]) else ""
+    out = io.StringIO()
+    out.write(
+        f"title:\t{d['title']}\n"
+        f"number:\t{d['number']}\n"
+        f"author:\t{author}\n"
+        f"category:\t{category}\n"
+        f"url:\t{d['url']}\n"
+        f"created:\t{d['createdAt']}\n"
+        "\n"
+        "--- BODY ---\n"
+        f"{d['body'] or '(empty)'}\n"
+        "\n"
+        "--- COMMENTS ---"
+    )
     for c in d["comments"]["nodes"]:
-        c_author = c["author"]["login"] if c["author"] else "ghost"
-        lines.append(f"\n[{c['id']}] {c_author} at {c['createdAt']}:")
-        lines.append(c["body"])
+        c_author = a["login"] if (a := c["author"]) else "ghost"
+        out.write(f"\n\n[{c['id']}] {c_author} at {c['createdAt']}:")
+        if with_body:
+            out.write(f"\n{c['body']}")
 
-    return {"exit_code": 0, "stdout": "\n".join(lines), "stderr": ""}
+    return {"exit_code": 0, "stdout": out.getvalue(), "stderr": ""}
 
 
 def _create_discussion(
     owner: str, repo: str, title: str, body: str, category: str, pat: str
 ) -> dict:
     """Create a discussion."""
-    repo_id = get_repository_id(owner, repo, pat)
-    category_id = _get_discussion_category_id(owner, repo, category, pat)
+    repo_id, category_id = _get_repo_and_category_ids(owner, repo, category, pat)
 
-    mutation = """
-    mutation($repositoryId: ID!, $categoryId: ID!, $title: String!, $body: String!) {
-        createDiscussion(input: {repositoryId: $repositoryId, categoryId: $categoryId, title: $title, body: $body}) {
-            discussion {
-                number
-                url
-            }
-        }
-    }
-    """
     variables = {
         "repositoryId": repo_id,
         "categoryId": category_id,
         "title": title,
         "body": body,
     }
-    result = execute_graphql(mutation, variables, pat)
+    result = execute_graphql(_M_CREATE_DISCUSSION, variables, pat)
     d = result["data"]["createDiscussion"]["discussion"]
 
     return {
@@ -428,22 +632,12 @@ def _update_discussion(
     """Update a discussion."""
     discussion_id = _get_discussion_node_id(owner, repo, number, pat)
 
-    mutation = """
-    mutation($discussionId: ID!, $title: String, $body: String) {
-        updateDiscussion(input: {discussionId: $discussionId, title: $title, body: $body}) {
-            discussion {
-                number
-                url
-            }
-        }
-    }
-    """
     variables = {
         "discussionId": discussion_id,
         "title": title,
         "body": body,
     }
-    result = execute_graphql(mutation, variables, pat)
+    result = execute_graphql(_M_UPDATE_DISCUSSION, variables, pat)
     d = result["data"]["updateDiscussion"]["discussion"]
 
     return {
@@ -459,22 +653,12 @@ def _add_comment(
     """Add a comment to a discussion."""
     discussion_id = _get_discussion_node_id(owner, repo, number, pat)
 
-    mutation = """
-    mutation($discussionId: ID!, $body: String!, $replyToId: ID) {
-        addDiscussionComment(input: {discussionId: $discussionId, body: $body, replyToId: $replyToId}) {
-            comment {
-                id
-                url
-            }
-        }
-    }
-    """
     variables = {
         "discussionId": discussion_id,
         "body": body,
         "replyToId": reply_to,
     }
-    result = execute_graphql(mutation, variables, pat)
+    result = execute_graphql(_M_ADD_COMMENT, variables, pat)
     c = result["data"]["addDiscussionComment"]["comment"]
 
     return {
@@ -486,21 +670,11 @@ def _add_comment(
 
 def _update_comment(comment_id: str, body: str, pat: str) -> dict:
     """Update a discussion comment."""
-    mutation = """
-    mutation($commentId: ID!, $body: String!) {
-        updateDiscussionComment(input: {commentId: $commentId, body: $body}) {
-            comment {
-                id
-                url
-            }
-        }
-    }
-    """
     variables = {
         "commentId": comment_id,
         "body": body,
     }
-    result = execute_graphql(mutation, variables, pat)
+    result = execute_graphql(_M_UPDATE_COMMENT, variables, pat)
     c = result["data"]["updateDiscussionComment"]["comment"]
 
     return {
@@ -514,17 +688,7 @@ def _close_discussion(owner: str, repo: str, number: int, pat: str) -> dict:
     """Close a discussion."""
     discussion_id = _get_discussion_node_id(owner, repo, number, pat)
 
-    mutation = """
-    mutation($discussionId: ID!) {
-        closeDiscussion(input: {discussionId: $discussionId}) {
-            discussion {
-                number
-                url
-            }
-        }
-    }
-    """
-    result = execute_graphql(mutation, {"discussionId": discussion_id}, pat)
+    result = execute_graphql(_M_CLOSE_DISCUSSION, {"discussionId": discussion_id}, pat)
     d = result["data"]["closeDiscussion"]["discussion"]
 
     return {
@@ -538,17 +702,7 @@ def _reopen_discussion(owner: str, repo: str, number: int, pat: str) -> dict:
     """Reopen a discussion."""
     discussion_id = _get_discussion_node_id(owner, repo, number, pat)
 
-    mutation = """
-    mutation($discussionId: ID!) {
-        reopenDiscussion(input: {discussionId: $discussionId}) {
-            discussion {
-                number
-                url
-            }
-        }
-    }
-    """
-    result = execute_graphql(mutation, {"discussionId": discussion_id}, pat)
+    result = execute_graphql(_M_REOPEN_DISCUSSION, {"discussionId": discussion_id}, pat)
     d = result["data"]["reopenDiscussion"]["discussion"]
 
     return {
@@ -562,16 +716,7 @@ def _delete_discussion(owner: str, repo: str, number: int, pat: str) -> dict:
     """Delete a discussion."""
     discussion_id = _get_discussion_node_id(owner, repo, number, pat)
 
-    mutation = """
-    mutation($discussionId: ID!) {
-        deleteDiscussion(input: {id: $discussionId}) {
-            discussion {
-                number
-            }
-        }
-    }
-    """
-    result = execute_graphql(mutation, {"discussionId": discussion_id}, pat)
+    result = execute_graphql(_M_DELETE_DISCUSSION, {"discussionId": discussion_id}, pat)
     d = result["data"]["deleteDiscussion"]["discussion"]
 
     return {
@@ -583,16 +728,7 @@ def _delete_discussion(owner: str, repo: str, number: int, pat: str) -> dict:
 
 def _delete_comment(comment_id: str, pat: str) -> dict:
     """Delete a discussion comment."""
-    mutation = """
-    mutation($commentId: ID!) {
-        deleteDiscussionComment(input: {id: $commentId}) {
-            comment {
-                id
-            }
-        }
-    }
-    """
-    result = execute_graphql(mutation, {"commentId": comment_id}, pat)
+    result = execute_graphql(_M_DELETE_COMMENT, {"commentId": comment_id}, pat)
     c = result["data"]["deleteDiscussionComment"]["comment"]
 
     return {
@@ -604,17 +740,7 @@ def _delete_comment(comment_id: str, pat: str) -> dict:
 
 def _mark_answer(comment_id: str, pat: str) -> dict:
     """Mark a comment as the answer."""
-    mutation = """
-    mutation($commentId: ID!) {
-        markDiscussionCommentAsAnswer(input: {id: $commentId}) {
-            discussion {
-                number
-                url
-            }
-        }
-    }
-    """
-    result = execute_graphql(mutation, {"commentId": comment_id}, pat)
+    result = execute_graphql(_M_MARK_ANSWER, {"commentId": comment_id}, pat)
     d = result["data"]["markDiscussionCommentAsAnswer"]["discussion"]
 
     return {
@@ -626,17 +752,7 @@ def _mark_answer(comment_id: str, pat: str) -> dict:
 
 def _unmark_answer(comment_id: str, pat: str) -> dict:
     """Unmark a comment as the answer."""
-    mutation = """
-    mutation($commentId: ID!) {
-        unmarkDiscussionCommentAsAnswer(input: {id: $commentId}) {
-            discussion {
-                number
-                url
-            }
-        }
-    }
-    """
-    result = execute_graphql(mutation, {"commentId": comment_id}, pat)
+    result = execute_graphql(_M_UNMARK_ANSWER, {"commentId": comment_id}, pat)
     d = result["data"]["unmarkDiscussionCommentAsAnswer"]["discussion"]
 
     return {
@@ -665,18 +781,7 @@ def _handle_poll(args: list[str], pat: str) -> dict:
 
 def _poll_vote(option_id: str, pat: str) -> dict:
     """Vote on a discussion poll."""
-    mutation = """
-    mutation($optionId: ID!) {
-        addDiscussionPollVote(input: {pollOptionId: $optionId}) {
-            pollOption {
-                id
-                option
-                totalVoteCount
-            }
-        }
-    }
-    """
-    result = execute_graphql(mutation, {"optionId": option_id}, pat)
+    result = execute_graphql(_M_POLL_VOTE, {"optionId": option_id}, pat)
     opt = result["data"]["addDiscussionPollVote"]["pollOption"]
 
     return {
@@ -5,8 +5,14 @@ Provides partial body replacement for Issues and Issue comments via REST API.
 Most issue subcommands fall through to gh CLI (returns None).
 """
 
-import json
-from urllib.request import Request, urlopen
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Final
+
+from ..core.args import parse_flags
+from ..core.cache import TTLCache
+from ..core.http import GITHUB_API_HEADERS, request
+from ..core.jsonutil import dumps, loads
 
 # Actions this module provides
 ACTIONS = [
@@ -15,10 +21,10 @@ ACTIONS = [
 ]
 
 # CLI command -> action mapping
-CLI_ACTIONS = {
+CLI_ACTIONS: Final[Mapping[str, str | None]] = MappingProxyType({
     "edit": "issues:edit",
     "comment_edit": "issues:comment_edit",
-}
+})
 
 
 def get_action(subcmd: str | None, args: list[str]) -> tuple[str | None, str | None]:
@@ -59,9 +65,24 @@ def execute(args: list[str], owner: str, repo: str, pat: str) -> dict | None:
 
 def _has_old_and_new(args: list[str]) -> bool:
     """Check if both --old and --new are present."""
-    has_old = any(a == "--old" for a in args)
-    has_new = any(a == "--new" for a in args)
-    return has_old and has_new
+    seen = 0
+    for a in args:
+        if a == "--old":
+            seen |= 1
+        elif a == "--new":
+            seen |= 2
+        else:
+            continue
+        if seen == 3:
+            return True
+    return False
+
+
+_EDIT_SPEC = {
+    "--old": ("old", True),
+    "--new": ("new", True),
+    "--replace-all": ("replace_all", False),
+}
 
 
 def _parse_edit_args(args: list[str]) -> tuple[list[str], str, str, bool]:
@@ -71,31 +92,8 @@ def _parse_edit_args(args: list[str]) -> tuple[list[str], str, str, bool]:
     Returns (positional_args, old, new, replace_all).
     Raises ValueError if --old or --new value is missing.
     """
-    positional = []
-    old = None
-    new = None
-    replace_all = False
-
-    i = 0
-    while i < len(args):
-        if args[i] == "--old":
-            if i + 1 >= len(args):
-                raise ValueError("--old requires a value")
-            old = args[i + 1]
-            i += 2
-        elif args[i] == "--new":
-            if i + 1 >= len(args):
-                raise ValueError("--new requires a value")
-            new = args[i + 1]
-            i += 2
-        elif args[i] == "--replace-all":
-            replace_all = True
-            i += 1
-        else:
-            positional.append(args[i])
-            i += 1
-
-    return positional, old, new, replace_all
+    values, positional = parse_flags(args, _EDIT_SPEC, strict=True)
+    return positional, values.get("old"), values.get("new"), values.get("replace_all", False)
 
 
 # =============================================================================
@@ -110,45 +108,83 @@ def _partial_replace(body: str, old: str, new: str, replace_all: bool) -> str:
     - Fail if old not found
     - Fail if old matches multiple locations (unless --replace-all)
     """
-    count = body.count(old)
-
-    if count == 0:
+    first = body.find(old)
+    if first < 0:
         raise ValueError("old string not found in body")
 
-    if count > 1 and not replace_all:
+    if replace_all:
+        return body.replace(old, new)
+
+    # Only a second hit matters here; count all of them just for the message
+    if body.find(old, first + max(len(old), 1)) >= 0:
         raise ValueError(
-            f"old string found {count} times in body "
+            f"old string found {body.count(old)} times in body "
             f"(use --replace-all to replace all occurrences)"
         )
 
-    if replace_all:
-        return body.replace(old, new)
-    else:
-        return body.replace(old, new, 1)
+    return body[:first] + new + body[first + len(old):]
 
 
 # =============================================================================
 # GitHub REST API
 # =============================================================================
 
-def _github_rest(method: str, url: str, pat: str, body: dict | None = None) -> dict:
-    """Execute GitHub REST API request."""
-    headers = {
-        "Authorization": f"Bearer {pat}",
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "fgp-proxy/1.0",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
+def _github_rest(
+    method: str, url: str, pat: str, body: dict | None = None, etag: str | None = None
+) -> tuple[dict | None, str | None]:
+    """
+    Execute GitHub REST API request.
+
+    If etag is given, the request is sent with If-None-Match.
+
+    Returns:
+        (response_json, etag). response_json is None when the resource
+        is unchanged since etag (304 Not Modified).
+    """
+    headers = {**GITHUB_API_HEADERS, "Authorization": f"Bearer {pat}"}
+    if etag:
+        headers["If-None-Match"] = etag
 
     data = None
     if body is not None:
         headers["Content-Type"] = "application/json"
-        data = json.dumps(body).encode("utf-8")
+        data = dumps(body)
+
+    status, response_headers, response_data = request(
+        method, url, data=data, headers=headers, timeout=30
+    )
 
-    req = Request(url, data=data, headers=headers, method=method)
+    if status == 304:
+        return None, etag
+    return loads(response_data), response_headers.get("ETag")
 
-    with urlopen(req, timeout=30) as response:
-        return json.loads(response.read().decode("utf-8"))
+
+# URL -> (ETag, body) of the last seen version of an issue or comment.
+# Repeat edits revalidate with a conditional GET; a 304 carries no payload
+# and does not count against the rate limit.
+_REST_SESSION_ETAGS = TTLCache(maxsize=256, ttl=3600)
+
+
+def _get_body(url: str, pat: str) -> str:
+    """GET the body of an issue or comment, revalidating any cached copy."""
+    cached = _REST_SESSION_ETAGS.get(url)
+    data, etag = _github_rest("GET", url, pat, etag=cached[0] if cached else None)
+    if data is None:
+        return cached[1]
+
+    current_body = data.get("body") or ""
+    if etag:
+        _REST_SESSION_ETAGS[url] = (etag, current_body)
+    return current_body
+
+
+def _patch_body(url: str, pat: str, updated_body: str) -> None:
+    """PATCH the body of an issue or comment and remember the new version."""
+    data, etag = _github_rest("PATCH", url, pat, body={"body": updated_body})
+    if etag:
+        _REST_SESSION_ETAGS[url] = (etag, data.get("body") or "")
+    else:
+        _REST_SESSION_ETAGS.pop(url, None)
 
 
 # =============================================================================
@@ -166,14 +202,13 @@ def _handle_edit(args: list[str], owner: str, repo: str, pat: str) -> dict:
 
     # GET current body
     url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-    issue_data = _github_rest("GET", url, pat)
-    current_body = issue_data.get("body") or ""
+    current_body = _get_body(url, pat)
 
     # Partial replace
     updated_body = _partial_replace(current_body, old, new, replace_all)
 
     # PATCH
-    _github_rest("PATCH", url, pat, body={"body": updated_body})
+    _patch_body(url, pat, updated_body)
 
     return {
         "exit_code": 0,
@@ -193,14 +228,13 @@ def _handle_comment_edit(args: list[str], owner: str, repo: str, pat: str) -> di
 
     # GET current body
     url = f"https://api.github.com/repos/{owner}/{repo}/issues/comments/{comment_id}"
-    comment_data = _github_rest("GET", url, pat)
-    current_body = comment_data.get("body") or ""
+    current_body = _get_body(url, pat)
 
     # Partial replace
     updated_body = _partial_replace(current_body, old, new, replace_all)
 
     # PATCH
-    _github_rest("PATCH", url, pat, body={"body": updated_body})
+    _patch_body(url, pat, updated_body)
 
     return {
         "exit_code": 0,
@@ -5,7 +5,12 @@ Provides GitHub Sub-Issues support via GraphQL API.
 gh CLI doesn't have `gh sub-issue` command, so this is a custom implementation.
 """
 
-from ..core.graphql import execute_graphql, get_issue_node_id
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Final
+
+from ..core.args import parse_flags
+from ..core.graphql import execute_graphql, get_issue_node_ids
 
 # Actions this module provides
 ACTIONS = [
@@ -17,13 +22,13 @@ ACTIONS = [
 ]
 
 # CLI command -> action mapping
-CLI_ACTIONS = {
+CLI_ACTIONS: Final[Mapping[str, str | None]] = MappingProxyType({
     "list": "subissues:list",
     "parent": "subissues:parent",
     "add": "subissues:add",
     "remove": "subissues:remove",
     "reorder": "subissues:reprioritize",
-}
+})
 
 
 def get_action(subcmd: str | None, args: list[str]) -> tuple[str | None, str | None]:
@@ -31,8 +36,7 @@ def get_action(subcmd: str | None, args: list[str]) -> tuple[str | None, str | N
     if subcmd is None:
         return None, None
 
-    action = CLI_ACTIONS.get(subcmd)
-    return (action, None) if action else (None, None)
+    return CLI_ACTIONS.get(subcmd), None
 
 
 def execute(args: list[str], owner: str, repo: str, pat: str) -> dict:
@@ -41,102 +45,166 @@ def execute(args: list[str], owner: str, repo: str, pat: str) -> dict:
         raise ValueError("sub-issue subcommand required")
 
     subcmd = args[0]
-    rest = args[1:]
-
-    if subcmd == "list":
-        if not rest:
-            raise ValueError("issue number required")
-        issue_number = int(rest[0])
-        result = _list_sub_issues(owner, repo, issue_number, pat)
-        lines = []
-        for item in result.get("sub_issues", []):
-            lines.append(f"{item['number']}\t{item['state']}\t{item['title']}")
-        return {"exit_code": 0, "stdout": "\n".join(lines), "stderr": ""}
-
-    elif subcmd == "parent":
-        if not rest:
-            raise ValueError("issue number required")
-        issue_number = int(rest[0])
-        result = _get_parent_issue(owner, repo, issue_number, pat)
-        parent = result.get("parent")
-        if parent:
-            stdout = f"{parent['number']}\t{parent['state']}\t{parent['title']}"
-        else:
-            stdout = "No parent issue"
-        return {"exit_code": 0, "stdout": stdout, "stderr": ""}
-
-    elif subcmd == "add":
-        if len(rest) < 2:
-            raise ValueError("parent and child issue numbers required")
-        parent_number = int(rest[0])
-        child_number = int(rest[1])
-        _add_sub_issue(owner, repo, parent_number, child_number, pat)
-        return {"exit_code": 0, "stdout": f"Added #{child_number} as sub-issue of #{parent_number}", "stderr": ""}
-
-    elif subcmd == "remove":
-        if len(rest) < 2:
-            raise ValueError("parent and child issue numbers required")
-        parent_number = int(rest[0])
-        child_number = int(rest[1])
-        _remove_sub_issue(owner, repo, parent_number, child_number, pat)
-        return {"exit_code": 0, "stdout": f"Removed #{child_number} from #{parent_number}", "stderr": ""}
-
-    elif subcmd == "reorder":
-        if len(rest) < 2:
-            raise ValueError("parent and child issue numbers required")
-        parent_number = int(rest[0])
-        child_number = int(rest[1])
-        before_number, after_number = _parse_reorder_args(rest[2:])
-        if not before_number and not after_number:
-            raise ValueError("--before or --after required")
-        _reprioritize_sub_issue(owner, repo, parent_number, child_number, before_number, after_number, pat)
-        return {"exit_code": 0, "stdout": "Reordered", "stderr": ""}
+    handler = _DISPATCH.get(subcmd)
+    if handler is None:
+        raise ValueError(f"Unknown sub-issue subcommand: {subcmd}")
+    return handler(args[1:], owner, repo, pat)
+
+
+# =============================================================================
+# Subcommand Dispatch
+# =============================================================================
+
+def _require_issue_number(rest: list[str]) -> int:
+    """Get the issue number from the first positional arg."""
+    if not rest:
+        raise ValueError("issue number required")
+    return int(rest[0])
+
+
+def _require_parent_and_child(rest: list[str]) -> tuple[int, int]:
+    """Get the parent and child issue numbers from the first two positional args."""
+    if len(rest) < 2:
+        raise ValueError("parent and child issue numbers required")
+    return int(rest[0]), int(rest[1])
 
+
+def _cmd_list(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    result = _list_sub_issues(owner, repo, _require_issue_number(rest), pat)
+    lines = []
+    for item in result.get("sub_issues", []):
+        lines.append(f"{item['number']}\t{item['state']}\t{item['title']}")
+    return {"exit_code": 0, "stdout": "\n".join(lines), "stderr": ""}
+
+
+def _cmd_parent(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    result = _get_parent_issue(owner, repo, _require_issue_number(rest), pat)
+    parent = result.get("parent")
+    if parent:
+        stdout = f"{parent['number']}\t{parent['state']}\t{parent['title']}"
     else:
-        raise ValueError(f"Unknown sub-issue subcommand: {subcmd}")
+        stdout = "No parent issue"
+    return {"exit_code": 0, "stdout": stdout, "stderr": ""}
+
+
+def _cmd_add(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    parent_number, child_number = _require_parent_and_child(rest)
+    _add_sub_issue(owner, repo, parent_number, child_number, pat)
+    return {"exit_code": 0, "stdout": f"Added #{child_number} as sub-issue of #{parent_number}", "stderr": ""}
+
+
+def _cmd_remove(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    parent_number, child_number = _require_parent_and_child(rest)
+    _remove_sub_issue(owner, repo, parent_number, child_number, pat)
+    return {"exit_code": 0, "stdout": f"Removed #{child_number} from #{parent_number}", "stderr": ""}
+
+
+def _cmd_reorder(rest: list[str], owner: str, repo: str, pat: str) -> dict:
+    parent_number, child_number = _require_parent_and_child(rest)
+    before_number, after_number = _parse_reorder_args(rest[2:])
+    if not before_number and not after_number:
+        raise ValueError("--before or --after required")
+    _reprioritize_sub_issue(owner, repo, parent_number, child_number, before_number, after_number, pat)
+    return {"exit_code": 0, "stdout": "Reordered", "stderr": ""}
+
+
+_DISPATCH = {
+    "list": _cmd_list,
+    "parent": _cmd_parent,
+    "add": _cmd_add,
+    "remove": _cmd_remove,
+    "reorder": _cmd_reorder,
+}
+
+
+# =============================================================================
+# Argument Parsing
+# =============================================================================
+
+_REORDER_SPEC = {
+    "--before": ("before", True),
+    "--after": ("after", True),
+}
 
 
 def _parse_reorder_args(args: list[str]) -> tuple[int | None, int | None]:
     """Parse --before and --after from args."""
-    before_number = None
-    after_number = None
-    i = 0
-    while i < len(args):
-        if args[i] == "--before" and i + 1 < len(args):
-            before_number = int(args[i + 1])
-            i += 2
-        elif args[i] == "--after" and i + 1 < len(args):
-            after_number = int(args[i + 1])
-            i += 2
-        else:
-            i += 1
+    values, _ = parse_flags(args, _REORDER_SPEC)
+    before_number = int(values["before"]) if "before" in values else None
+    after_number = int(values["after"]) if "after" in values else None
     return before_number, after_number
 
 
 # =============================================================================
-# GraphQL Operations
+# GraphQL Documents
 # =============================================================================
 
-def _list_sub_issues(owner: str, repo: str, issue_number: int, pat: str) -> dict:
-    """List sub-issues of an issue."""
-    query = """
-    query($owner: String!, $repo: String!, $number: Int!) {
-        repository(owner: $owner, name: $repo) {
-            issue(number: $number) {
-                subIssues(first: 50) {
-                    nodes {
-                        number
-                        title
-                        state
-                    }
+_Q_LIST_SUB_ISSUES = """
+query($owner: String!, $repo: String!, $number: Int!) {
+    repository(owner: $owner, name: $repo) {
+        issue(number: $number) {
+            subIssues(first: 50) {
+                nodes {
+                    number
+                    title
+                    state
                 }
             }
         }
     }
-    """
+}
+"""
+
+_Q_PARENT_ISSUE = """
+query($owner: String!, $repo: String!, $number: Int!) {
+    repository(owner: $owner, name: $repo) {
+        issue(number: $number) {
+            parent {
+                number
+                title
+                state
+            }
+        }
+    }
+}
+"""
+
+_M_ADD_SUB_ISSUE = """
+mutation($issueId: ID!, $subIssueId: ID!, $replaceParent: Boolean) {
+    addSubIssue(input: {issueId: $issueId, subIssueId: $subIssueId, replaceParent: $replaceParent}) {
+        issue { number }
+        subIssue { number }
+    }
+}
+"""
+
+_M_REMOVE_SUB_ISSUE = """
+mutation($issueId: ID!, $subIssueId: ID!) {
+    removeSubIssue(input: {issueId: $issueId, subIssueId: $subIssueId}) {
+        issue { number }
+        subIssue { number }
+    }
+}
+"""
+
+_M_REPRIORITIZE_SUB_ISSUE = """
+mutation($issueId: ID!, $subIssueId: ID!, $beforeId: ID, $afterId: ID) {
+    reprioritizeSubIssue(input: {issueId: $issueId, subIssueId: $subIssueId, beforeId: $beforeId, afterId: $afterId}) {
+        issue { number }
+    }
+}
+"""
+
+
+# =============================================================================
+# GraphQL Operations
+# =============================================================================
+
+def _list_sub_issues(owner: str, repo: str, issue_number: int, pat: str) -> dict:
+    """List sub-issues of an issue."""
     variables = {"owner": owner, "repo": repo, "number": issue_number}
     result = execute_graphql(
-        query, variables, pat,
+        _Q_LIST_SUB_ISSUES, variables, pat,
         extra_headers={"GraphQL-Features": "sub_issues"}
     )
 
@@ -150,22 +218,9 @@ def _list_sub_issues(owner: str, repo: str, issue_number: int, pat: str) -> dict
 
 def _get_parent_issue(owner: str, repo: str, issue_number: int, pat: str) -> dict:
     """Get parent issue of an issue."""
-    query = """
-    query($owner: String!, $repo: String!, $number: Int!) {
-        repository(owner: $owner, name: $repo) {
-            issue(number: $number) {
-                parent {
-                    number
-                    title
-                    state
-                }
-            }
-        }
-    }
-    """
     variables = {"owner": owner, "repo": repo, "number": issue_number}
     result = execute_graphql(
-        query, variables, pat,
+        _Q_PARENT_ISSUE, variables, pat,
         extra_headers={"GraphQL-Features": "sub_issues"}
     )
 
@@ -182,24 +237,17 @@ def _add_sub_issue(
     replace_parent: bool = False
 ) -> dict:
     """Add a sub-issue to an issue."""
-    issue_id = get_issue_node_id(owner, repo, issue_number, pat)
-    sub_issue_id = get_issue_node_id(owner, repo, sub_issue_number, pat)
-
-    mutation = """
-    mutation($issueId: ID!, $subIssueId: ID!, $replaceParent: Boolean) {
-        addSubIssue(input: {issueId: $issueId, subIssueId: $subIssueId, replaceParent: $replaceParent}) {
-            issue { number }
-            subIssue { number }
-        }
-    }
-    """
+    ids = get_issue_node_ids(owner, repo, [issue_number, sub_issue_number], pat)
+    issue_id = ids[issue_number]
+    sub_issue_id = ids[sub_issue_number]
+
     variables = {
         "issueId": issue_id,
         "subIssueId": sub_issue_id,
         "replaceParent": replace_parent
     }
     execute_graphql(
-        mutation, variables, pat,
+        _M_ADD_SUB_ISSUE, variables, pat,
         extra_headers={"GraphQL-Features": "sub_issues"}
     )
 
@@ -214,20 +262,13 @@ def _remove_sub_issue(
     owner: str, repo: str, issue_number: int, sub_issue_number: int, pat: str
 ) -> dict:
     """Remove a sub-issue from an issue."""
-    issue_id = get_issue_node_id(owner, repo, issue_number, pat)
-    sub_issue_id = get_issue_node_id(owner, repo, sub_issue_number, pat)
-
-    mutation = """
-    mutation($issueId: ID!, $subIssueId: ID!) {
-        removeSubIssue(input: {issueId: $issueId, subIssueId: $subIssueId}) {
-            issue { number }
-            subIssue { number }
-        }
-    }
-    """
+    ids = get_issue_node_ids(owner, repo, [issue_number, sub_issue_number], pat)
+    issue_id = ids[issue_number]
+    sub_issue_id = ids[sub_issue_number]
+
     variables = {"issueId": issue_id, "subIssueId": sub_issue_id}
     execute_graphql(
-        mutation, variables, pat,
+        _M_REMOVE_SUB_ISSUE, variables, pat,
         extra_headers={"GraphQL-Features": "sub_issues"}
     )
 
@@ -243,23 +284,18 @@ def _reprioritize_sub_issue(
     before_number: int | None, after_number: int | None, pat: str
 ) -> dict:
     """Reprioritize a sub-issue."""
-    issue_id = get_issue_node_id(owner, repo, issue_number, pat)
-    sub_issue_id = get_issue_node_id(owner, repo, sub_issue_number, pat)
-
-    before_id = None
-    after_id = None
+    numbers = [issue_number, sub_issue_number]
     if before_number:
-        before_id = get_issue_node_id(owner, repo, before_number, pat)
+        numbers.append(before_number)
     if after_number:
-        after_id = get_issue_node_id(owner, repo, after_number, pat)
+        numbers.append(after_number)
+    ids = get_issue_node_ids(owner, repo, numbers, pat)
+
+    issue_id = ids[issue_number]
+    sub_issue_id = ids[sub_issue_number]
+    before_id = ids[before_number] if before_number else None
+    after_id = ids[after_number] if after_number else None
 
-    mutation = """
-    mutation($issueId: ID!, $subIssueId: ID!, $beforeId: ID, $afterId: ID) {
-        reprioritizeSubIssue(input: {issueId: $issueId, subIssueId: $subIssueId, beforeId: $beforeId, afterId: $afterId}) {
-            issue { number }
-        }
-    }
-    """
     variables = {
         "issueId": issue_id,
         "subIssueId": sub_issue_id,
@@ -267,7 +303,7 @@ def _reprioritize_sub_issue(
         "afterId": after_id
     }
     execute_graphql(
-        mutation, variables, pat,
+        _M_REPRIORITIZE_SUB_ISSUE, variables, pat,
         extra_headers={"GraphQL-Features": "sub_issues"}
     )
 
@@ -1,11 +1,16 @@
 """Core functionality for fgp proxy."""
 
 from .policy import (
+    compile_rules,
     evaluate_policy,
+    evaluate_policy_any,
     expand_action_pattern,
     expand_repo_pattern,
+    index_rules,
     resolve_param_branch,
     match_endpoint,
+    match_endpoint_action,
+    match_endpoint_actions,
     match_git_endpoint,
     select_pat,
     load_config,
@@ -19,11 +24,16 @@ from .policy import (
 from .graphql import execute_graphql
 
 __all__ = [
+    "compile_rules",
     "evaluate_policy",
+    "evaluate_policy_any",
     "expand_action_pattern",
     "expand_repo_pattern",
+    "index_rules",
     "resolve_param_branch",
     "match_endpoint",
+    "match_endpoint_action",
+    "match_endpoint_actions",
     "match_git_endpoint",
     "select_pat",
     "load_config",
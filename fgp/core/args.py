@@ -0,0 +1,49 @@
+"""
+CLI argument parsing utilities.
+"""
+
+
+def parse_flags(
+    args: list[str],
+    spec: dict[str, tuple[str, bool]],
+    strict: bool = False,
+) -> tuple[dict[str, str | bool], list[str]]:
+    """
+    Parse flags from args in a single pass.
+
+    spec maps each flag (e.g. "--title", "-t") to (dest, takes_value).
+    A flag that takes a value consumes the next arg; any other flag is
+    stored as True. Args not in spec are returned as positionals.
+
+    A value flag at the end of args is ignored, or rejected if strict.
+
+    Returns:
+        (values, positional)
+
+    Raises:
+        ValueError: If strict and a value flag has no value
+    """
+    values = {}
+    positional = []
+    n = len(args)
+    i = 0
+    while i < n:
+        entry = spec.get(args[i])
+        if entry is None:
+            positional.append(args[i])
+            i += 1
+            continue
+
+        dest, takes_value = entry
+        if not takes_value:
+            values[dest] = True
+            i += 1
+        elif i + 1 < n:
+            values[dest] = args[i + 1]
+            i += 2
+        elif strict:
+            raise ValueError(f"{args[i]} requires a value")
+        else:
+            i += 1
+
+    return values, positional
@@ -2,8 +2,17 @@
 GraphQL execution utilities.
 """
 
-import json
-from urllib.request import Request, urlopen
+import asyncio
+
+from .cache import TTLCache
+from .http import GITHUB_API_HEADERS, request
+from .jsonutil import dumps, loads
+
+# Node IDs are stable, so lookups are cached. Entries expire after an hour so
+# a renamed, transferred or recreated repository is eventually re-resolved.
+# Keys omit the PAT: an ID alone grants nothing, the mutation using it is
+# still authorized against the caller's PAT.
+_ID_CACHE = TTLCache(maxsize=4096, ttl=3600)
 
 
 def execute_graphql(
@@ -34,59 +43,166 @@ def execute_graphql(
         body["variables"] = variables
 
     headers = {
+        **GITHUB_API_HEADERS,
         "Authorization": f"bearer {pat}",
         "Content-Type": "application/json",
-        "User-Agent": "fgp-proxy/1.0",
     }
-
     if extra_headers:
         headers.update(extra_headers)
 
-    req = Request(
-        url,
-        data=json.dumps(body).encode("utf-8"),
+    _, _, data = request(
+        "POST", url,
+        data=dumps(body),
         headers=headers,
-        method="POST"
+        timeout=30
     )
 
-    with urlopen(req, timeout=30) as response:
-        result = json.loads(response.read().decode("utf-8"))
-        if "errors" in result:
-            raise ValueError(f"GraphQL error: {result['errors']}")
-        return result
+    result = loads(data)
+    if "errors" in result:
+        raise ValueError(f"GraphQL error: {result['errors']}")
+    return result
+
+
+async def execute_graphql_async(
+    query: str,
+    variables: dict,
+    pat: str,
+    extra_headers: dict | None = None
+) -> dict:
+    """
+    Awaitable execute_graphql().
+
+    The request runs in the default thread pool, so several queries can be
+    in flight at once (e.g. with asyncio.gather) without blocking the event
+    loop. Connections still come from the shared keep-alive pool.
+    """
+    return await asyncio.to_thread(execute_graphql, query, variables, pat, extra_headers)
+
+
+# GitHub caps aliased lookups well above this; 100 keeps each query small
+_MAX_ALIASES_PER_QUERY = 100
+
+
+def _chunks(items: list, size: int):
+    """Yield consecutive slices of items, each at most size long."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def get_repository_ids(repos: list[tuple[str, str]], pat: str) -> dict[tuple[str, str], str]:
+    """
+    Get node IDs for several repositories.
+
+    Uncached repositories are resolved with aliased queries
+    (r0: repository(owner: $o0, name: $r0) { id } ...), up to
+    _MAX_ALIASES_PER_QUERY per request.
+
+    Returns:
+        Mapping of (owner, repo) as passed in to node ID
+    """
+    ids = {}
+    missing = []
+    for owner, repo in dict.fromkeys(repos):
+        cached = _ID_CACHE.get(("repository", owner.lower(), repo.lower()))
+        if cached is not None:
+            ids[(owner, repo)] = cached
+        else:
+            missing.append((owner, repo))
+
+    for chunk in _chunks(missing, _MAX_ALIASES_PER_QUERY):
+        params = ", ".join(f"$o{i}: String!, $r{i}: String!" for i in range(len(chunk)))
+        fields = " ".join(
+            f"r{i}: repository(owner: $o{i}, name: $r{i}) {{ id }}" for i in range(len(chunk))
+        )
+        variables = {}
+        for i, (owner, repo) in enumerate(chunk):
+            variables[f"o{i}"] = owner
+            variables[f"r{i}"] = repo
+
+        result = execute_graphql(f"query({params}) {{ {fields} }}", variables, pat)
+
+        data = result.get("data") or {}
+        for i, (owner, repo) in enumerate(chunk):
+            repository = data.get(f"r{i}")
+            if not repository:
+                raise ValueError(f"Repository {owner}/{repo} not found")
+            _ID_CACHE[("repository", owner.lower(), repo.lower())] = repository["id"]
+            ids[(owner, repo)] = repository["id"]
+    return ids
 
 
 def get_repository_id(owner: str, repo: str, pat: str) -> str:
     """Get repository node ID."""
-    query = """
-    query($owner: String!, $repo: String!) {
-        repository(owner: $owner, name: $repo) {
-            id
-        }
-    }
+    return get_repository_ids([(owner, repo)], pat)[(owner, repo)]
+
+
+def remember_repository_id(owner: str, repo: str, repository_id: str) -> None:
+    """Cache a repository node ID that a caller's own query returned."""
+    _ID_CACHE[("repository", owner.lower(), repo.lower())] = repository_id
+
+
+def get_issue_node_ids_multi(
+    issues: list[tuple[str, str, int]], pat: str
+) -> dict[tuple[str, str, int], str]:
     """
-    result = execute_graphql(query, {"owner": owner, "repo": repo}, pat)
-    return result["data"]["repository"]["id"]
+    Get node IDs for issues across any number of repositories.
 
+    Uncached issues are resolved with aliased queries
+    (i0: repository(owner: $o0, name: $r0) { issue(number: $n0) { id } } ...),
+    up to _MAX_ALIASES_PER_QUERY per request.
 
-def get_issue_node_id(owner: str, repo: str, issue_number: int, pat: str) -> str:
-    """Get issue node ID."""
-    query = """
-    query($owner: String!, $repo: String!, $number: Int!) {
-        repository(owner: $owner, name: $repo) {
-            issue(number: $number) {
-                id
-            }
-        }
-    }
+    Returns:
+        Mapping of (owner, repo, number) as passed in to node ID
     """
-    variables = {"owner": owner, "repo": repo, "number": issue_number}
-    result = execute_graphql(
-        query, variables, pat,
-        extra_headers={"GraphQL-Features": "sub_issues"}
-    )
+    ids = {}
+    missing = []
+    for owner, repo, number in dict.fromkeys(issues):
+        cached = _ID_CACHE.get(("issue", owner.lower(), repo.lower(), number))
+        if cached is not None:
+            ids[(owner, repo, number)] = cached
+        else:
+            missing.append((owner, repo, number))
+
+    for chunk in _chunks(missing, _MAX_ALIASES_PER_QUERY):
+        params = ", ".join(
+            f"$o{i}: String!, $r{i}: String!, $n{i}: Int!" for i in range(len(chunk))
+        )
+        fields = " ".join(
+            f"i{i}: repository(owner: $o{i}, name: $r{i}) {{ issue(number: $n{i}) {{ id }} }}"
+            for i in range(len(chunk))
+        )
+        variables = {}
+        for i, (owner, repo, number) in enumerate(chunk):
+            variables[f"o{i}"] = owner
+            variables[f"r{i}"] = repo
+            variables[f"n{i}"] = number
+
+        result = execute_graphql(
+            f"query({params}) {{ {fields} }}", variables, pat,
+            extra_headers={"GraphQL-Features": "sub_issues"}
+        )
+
+        data = result.get("data") or {}
+        for i, (owner, repo, number) in enumerate(chunk):
+            issue = (data.get(f"i{i}") or {}).get("issue")
+            if not issue:
+                raise ValueError(f"Issue #{number} not found in {owner}/{repo}")
+            _ID_CACHE[("issue", owner.lower(), repo.lower(), number)] = issue["id"]
+            ids[(owner, repo, number)] = issue["id"]
+    return ids
+
+
+def get_issue_node_ids(owner: str, repo: str, numbers: list[int], pat: str) -> dict[int, str]:
+    """
+    Get node IDs for several issues of one repository.
+
+    Returns:
+        Mapping of issue number to node ID
+    """
+    ids = get_issue_node_ids_multi([(owner, repo, n) for n in numbers], pat)
+    return {number: ids[(owner, repo, number)] for number in dict.fromkeys(numbers)}
+
 
-    issue = result.get("data", {}).get("repository", {}).get("issue")
-    if not issue:
-        raise ValueError(f"Issue #{issue_number} not found in {owner}/{repo}")
-    return issue["id"]
+def get_issue_node_id(owner: str, repo: str, issue_number: int, pat: str) -> str:
+    """Get issue node ID."""
+    return get_issue_node_ids(owner, repo, [issue_number], pat)[issue_number]
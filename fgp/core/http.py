@@ -0,0 +1,311 @@
+"""
+HTTP client utilities.
+
+Connections to GitHub are kept alive and reused, so consecutive requests
+to the same host skip the TCP and TLS handshakes that urlopen() pays on
+every call. Proxy environment variables (HTTPS_PROXY, NO_PROXY, ...) are
+honoured as urlopen() honours them.
+"""
+
+import base64
+import gzip
+import select
+import threading
+from collections.abc import Iterable
+from http.client import (
+    HTTPConnection,
+    HTTPException,
+    HTTPMessage,
+    HTTPResponse,
+    HTTPSConnection,
+)
+from io import BytesIO
+from types import MappingProxyType
+from urllib.error import HTTPError, URLError
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+# Idle keep-alive connections per (scheme, host)
+_POOL: dict[tuple[str, str], list[HTTPConnection]] = {}
+_POOL_LOCK = threading.Lock()
+_MAX_IDLE_PER_HOST = 4
+
+_MAX_REDIRECTS = 10
+
+# Headers every api.github.com call sends; callers add Authorization
+GITHUB_API_HEADERS = MappingProxyType({
+    "Accept": "application/vnd.github+json",
+    "User-Agent": "fgp-proxy/1.0",
+    "X-GitHub-Api-Version": "2022-11-28",
+})
+
+# Methods that are safe to re-send when a reused connection turns out to be
+# dead. Anything else (POST, PATCH: GraphQL mutations, comments, ...) may
+# already have been applied by the server, so it is never sent twice.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def _is_dead(conn: HTTPConnection) -> bool:
+    """
+    Check whether an idle connection was closed by the server.
+
+    An idle keep-alive socket has nothing to read, so readability means the
+    peer sent EOF (or stray data); either way the connection is unusable.
+    """
+    if conn.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _new_connection(scheme: str, host: str, timeout: float) -> HTTPConnection:
+    """
+    Open a connection, tunnelling through HTTPS_PROXY / HTTP_PROXY (with
+    NO_PROXY honoured) the way urlopen() does.
+    """
+    connection_class = HTTPSConnection if scheme == "https" else HTTPConnection
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(host):
+        return connection_class(host, timeout=timeout)
+
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    proxy_parts = urlsplit(proxy)
+    headers = {}
+    if proxy_parts.username is not None:
+        credentials = f"{unquote(proxy_parts.username)}:{unquote(proxy_parts.password or '')}"
+        headers["Proxy-Authorization"] = f"Basic {base64.b64encode(credentials.encode()).decode()}"
+
+    # Connect to the proxy and CONNECT through to host; for https the TLS
+    # session is then negotiated with host itself
+    conn = connection_class(proxy_parts.hostname, proxy_parts.port or 80, timeout=timeout)
+    conn.set_tunnel(host, headers=headers)
+    return conn
+
+
+def _acquire(
+    scheme: str, host: str, timeout: float, fresh: bool = False
+) -> tuple[HTTPConnection, bool]:
+    """Take a live idle connection from the pool (unless fresh) or open a new one."""
+    while not fresh:
+        with _POOL_LOCK:
+            idle = _POOL.get((scheme, host))
+            conn = idle.pop() if idle else None
+        if conn is None:
+            break
+        if _is_dead(conn):
+            conn.close()
+            continue
+
+        conn.timeout = timeout
+        conn.sock.settimeout(timeout)
+        return conn, True
+
+    return _new_connection(scheme, host, timeout), False
+
+
+def _release(scheme: str, host: str, conn: HTTPConnection) -> None:
+    """Return a connection to the pool, or close it if the pool is full."""
+    with _POOL_LOCK:
+        idle = _POOL.setdefault((scheme, host), [])
+        if conn.sock is not None and len(idle) < _MAX_IDLE_PER_HOST:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def _send(
+    method: str, url: str, data: bytes | None, headers: dict, timeout: float
+) -> tuple[int, str, HTTPMessage, bytes]:
+    """Send one request (no redirect handling) and read the whole response."""
+    parts = urlsplit(url)
+    target = parts.path or "/"
+    if parts.query:
+        target += f"?{parts.query}"
+
+    # _acquire() skips idle connections the server has visibly closed, but a
+    # close can still race with the request; retry once on a fresh
+    # connection, for idempotent methods only.
+    for attempt in range(2):
+        conn, reused = _acquire(parts.scheme, parts.netloc, timeout)
+        try:
+            conn.request(method, target, body=data, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (ConnectionError, HTTPException) as e:
+            conn.close()
+            if reused and attempt == 0 and method in _IDEMPOTENT_METHODS:
+                continue
+            raise URLError(e) from e
+        except OSError as e:
+            conn.close()
+            raise URLError(e) from e
+
+        if response.will_close:
+            conn.close()
+        else:
+            _release(parts.scheme, parts.netloc, conn)
+        return response.status, response.reason, response.headers, body
+
+    raise AssertionError("unreachable")
+
+
+def request(
+    method: str,
+    url: str,
+    data: bytes | None = None,
+    headers: dict | None = None,
+    timeout: float = 30,
+) -> tuple[int, HTTPMessage, bytes]:
+    """
+    Send an HTTP request over a pooled keep-alive connection.
+
+    Mirrors urlopen() semantics: redirects are followed for GET/HEAD (and
+    POST on 301/302/303, re-sent as GET), and error statuses raise.
+    gzip is requested unless the caller sets Accept-Encoding, and is
+    decoded transparently.
+
+    Returns:
+        (status, headers, body). 304 Not Modified is returned, not raised.
+
+    Raises:
+        HTTPError: On 4xx/5xx, or a redirect that is not followed
+        URLError: If the connection fails
+    """
+    headers = dict(headers or {})
+    decode_gzip = not any(k.lower() == "accept-encoding" for k in headers)
+    if decode_gzip:
+        headers["Accept-Encoding"] = "gzip"
+
+    for _ in range(_MAX_REDIRECTS + 1):
+        status, reason, response_headers, body = _send(method, url, data, headers, timeout)
+
+        if decode_gzip and response_headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        location = response_headers.get("Location")
+        redirect = location and (
+            (status in (301, 302, 303, 307, 308) and method in ("GET", "HEAD"))
+            or (status in (301, 302, 303) and method == "POST")
+        )
+        if redirect:
+            url = urljoin(url, location)
+            if method == "POST":
+                method = "GET"
+                data = None
+                headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+            continue
+
+        if status >= 400 or (300 <= status < 400 and status != 304):
+            raise HTTPError(url, status, reason, response_headers, BytesIO(body))
+
+        return status, response_headers, body
+
+    raise HTTPError(url, status, "Too many redirects", response_headers, BytesIO(body))
+
+
+class StreamedResponse:
+    """
+    Response whose body is read incrementally by the caller.
+
+    Use as a context manager (or call close()); the connection goes back
+    to the pool only if the body was read to the end.
+    """
+
+    def __init__(self, scheme: str, host: str, conn: HTTPConnection, response: HTTPResponse):
+        self._scheme = scheme
+        self._host = host
+        self._conn = conn
+        self._response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+    def read(self, amt: int | None = None) -> bytes:
+        return self._response.read(amt)
+
+    def readinto(self, buffer) -> int:
+        return self._response.readinto(buffer)
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        if self._response.isclosed() and not self._response.will_close:
+            _release(self._scheme, self._host, self._conn)
+        else:
+            self._response.close()
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self) -> "StreamedResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def stream(
+    method: str,
+    url: str,
+    data: bytes | Iterable[bytes] | None = None,
+    headers: dict | None = None,
+    timeout: float = 30,
+) -> StreamedResponse:
+    """
+    Send an HTTP request and return the response without reading its body.
+
+    data may be an iterable of byte chunks, which is sent as it is
+    produced: with the caller's Content-Length if set, chunked otherwise.
+    Such a body can only be sent once, so it always goes over a new
+    connection. Redirects are followed for GET/HEAD only, and no
+    Accept-Encoding is added, so the body arrives as the server sent it.
+
+    Raises:
+        HTTPError: On 4xx/5xx, or a redirect that is not followed
+        URLError: If the connection fails
+    """
+    headers = dict(headers or {})
+    replayable = data is None or isinstance(data, (bytes, bytearray))
+
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+
+        for attempt in range(2):
+            conn, reused = _acquire(parts.scheme, parts.netloc, timeout, fresh=not replayable)
+            try:
+                conn.request(method, target, body=data, headers=headers)
+                response = conn.getresponse()
+            except (ConnectionError, HTTPException) as e:
+                conn.close()
+                if reused and attempt == 0 and method in _IDEMPOTENT_METHODS:
+                    continue
+                raise URLError(e) from e
+            except OSError as e:
+                conn.close()
+                raise URLError(e) from e
+            break
+
+        result = StreamedResponse(parts.scheme, parts.netloc, conn, response)
+        status = response.status
+        location = response.headers.get("Location")
+
+        if location and status in (301, 302, 303, 307, 308) and method in ("GET", "HEAD"):
+            result.read()
+            result.close()
+            url = urljoin(url, location)
+            continue
+
+        if status >= 400 or (300 <= status < 400 and status != 304):
+            body = result.read()
+            result.close()
+            raise HTTPError(url, status, response.reason, response.headers, BytesIO(body))
+
+        return result
+
+    raise HTTPError(url, status, "Too many redirects", response.headers, BytesIO(b""))
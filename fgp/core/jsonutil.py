@@ -0,0 +1,48 @@
+"""
+JSON encoding utilities.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths take bytes in and give bytes out, so callers never
+need an extra encode/decode step.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+if orjson is not None:
+
+    def loads(data: bytes | str):
+        """Parse JSON from bytes or str."""
+        return orjson.loads(data)
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes (2-space indent if indent)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+else:
+
+    def loads(data: bytes | str):
+        """Parse JSON from bytes or str."""
+        if isinstance(data, (bytes, bytearray)):
+            try:
+                data = data.decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise JSONDecodeError(str(e), "", 0) from e
+        return json.loads(data)
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes (2-space indent if indent)."""
+        # ensure_ascii=False and these separators match orjson's output byte for byte
+        if indent:
+            text = json.dumps(obj, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+        return text.encode("utf-8")
@@ -5,13 +5,17 @@ AWS IAM-style policy evaluation for GitHub API access control.
 """
 
 import fnmatch
-import json
 import re
 import sys
+from collections.abc import Callable
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
 
 import json5
 
+from .jsonutil import JSONDecodeError, loads
+
 DEFAULT_CONFIG_PATH = Path.home() / ".config" / "github-proxy" / "config.json"
 DEFAULT_PORT = 8766
 
@@ -120,6 +124,173 @@ GIT_ENDPOINT_ACTIONS = [
     ("POST", r"/git/(?P<owner>[^/]+)/(?P<repo>[^/]+)\.git/git-receive-pack$", "git:write"),
 ]
 
+
+_GROUP_NAME_RE = re.compile(r"\(\?P<(\w+)>")
+
+
+def _fuse_patterns(
+    entries: list[tuple[str, str]],
+) -> tuple[re.Pattern, dict[int, tuple[str, tuple[tuple[str, str], ...]]]]:
+    """
+    Fuse endpoint patterns into a single alternation regex.
+
+    Each pattern becomes one branch wrapped in its own group, so the regex
+    engine tries them left to right in one call and first-match precedence
+    is kept. Python forbids duplicate group names, so named groups are
+    prefixed per branch and mapped back to their original names on match.
+    The trailing $ of each pattern is dropped in favor of fullmatch().
+
+    Returns:
+        (fused regex, {branch group index: (action, ((fused name, name), ...))})
+    """
+    parts = []
+    names_by_branch = []
+    for i, (pattern, _action) in enumerate(entries):
+        if not pattern.endswith("$"):
+            raise ValueError(f"Endpoint pattern must be anchored with $: {pattern}")
+        pattern = pattern[:-1]
+        names = _GROUP_NAME_RE.findall(pattern)
+        renamed = _GROUP_NAME_RE.sub(lambda m, i=i: f"(?P<_{i}_{m.group(1)}>", pattern)
+        parts.append(f"(?P<_{i}>{renamed})")
+        names_by_branch.append(tuple((f"_{i}_{name}", name) for name in names))
+
+    fused = re.compile("|".join(parts))
+    branches = {
+        fused.groupindex[f"_{i}"]: (action, names_by_branch[i])
+        for i, (_pattern, action) in enumerate(entries)
+    }
+    return fused, branches
+
+
+def _compile_by_method(
+    entries: list[tuple[str, str, str]],
+) -> dict[str, tuple[re.Pattern, dict[int, tuple[str, tuple[tuple[str, str], ...]]]]]:
+    """Group endpoint patterns by HTTP method and fuse each group, keeping table order."""
+    by_method: dict[str, list[tuple[str, str]]] = {}
+    for method, pattern, action in entries:
+        by_method.setdefault(method, []).append((pattern, action))
+    return {method: _fuse_patterns(group) for method, group in by_method.items()}
+
+
+def _match_fused(table: dict, method: str, path: str) -> tuple[str | None, dict]:
+    """Match path against the fused regex for method."""
+    fused = table.get(method)
+    if fused is None:
+        return None, {}
+    regex, branches = fused
+    match = regex.fullmatch(path)
+    if not match:
+        return None, {}
+    # The branch wrapper closes after its inner groups, so it is lastindex
+    action, names = branches[match.lastindex]
+    return action, {name: match.group(fused_name) for fused_name, name in names}
+
+
+# Segment trie for ENDPOINT_ACTIONS. Each node maps static path segments to
+# child nodes; the sentinel keys below hold the non-static edges.
+_TERMINAL = object()  # (table index, actions) of a route ending here
+_PARAMS = object()    # {(name, digits_only): child} for one-segment params
+_TAILS = object()     # [(name, allow_empty, table index, actions)] for .* / .+ tails
+
+_ROUTE_SEGMENT_RE = re.compile(r"/(?:\(\?P<(\w+)>([^)]*)\)|([\w.-]+))")
+_PARAM_KINDS = {r"[^/]+": False, r"\d+": True}
+_TAIL_KINDS = {".*": True, ".+": False}
+
+
+def _insert_route(root: dict, pattern: str, index: int, action: str) -> None:
+    """Add one ENDPOINT_ACTIONS pattern to a method's trie."""
+    if not pattern.endswith("$"):
+        raise ValueError(f"Endpoint pattern must be anchored with $: {pattern}")
+    body = pattern[:-1]
+
+    node = root
+    pos = 0
+    while pos < len(body):
+        segment = _ROUTE_SEGMENT_RE.match(body, pos)
+        if not segment:
+            raise ValueError(f"Unsupported endpoint pattern: {pattern}")
+        pos = segment.end()
+        name, kind, literal = segment.groups()
+
+        if literal is not None:
+            node = node.setdefault(literal, {})
+        elif kind in _PARAM_KINDS:
+            node = node.setdefault(_PARAMS, {}).setdefault((name, _PARAM_KINDS[kind]), {})
+        elif kind in _TAIL_KINDS and pos == len(body):
+            tails = node.setdefault(_TAILS, [])
+            for i, (tail_name, allow_empty, first_index, actions) in enumerate(tails):
+                if (tail_name, allow_empty) == (name, _TAIL_KINDS[kind]):
+                    tails[i] = (tail_name, allow_empty, first_index, actions + (action,))
+                    return
+            tails.append((name, _TAIL_KINDS[kind], index, (action,)))
+            return
+        else:
+            raise ValueError(f"Unsupported endpoint pattern: {pattern}")
+
+    # Duplicate routes share one node; the earliest entry's action comes
+    # first, so match_endpoint keeps first-match-wins behavior
+    first_index, actions = node.get(_TERMINAL, (index, ()))
+    node[_TERMINAL] = (first_index, actions + (action,))
+
+
+def _build_route_tries(entries: list[tuple[str, str, str]]) -> dict[str, dict]:
+    """Build one segment trie per HTTP method from ENDPOINT_ACTIONS."""
+    tries: dict[str, dict] = {}
+    for index, (method, pattern, action) in enumerate(entries):
+        _insert_route(tries.setdefault(method, {}), pattern, index, action)
+    return tries
+
+
+def _walk_route(
+    node: dict, segments: list[str], i: int, params: tuple | None
+) -> tuple[int, tuple[str, ...], tuple | None] | None:
+    """
+    Find the matching route with the lowest table index below node.
+
+    Static, parameter and tail edges can all match the same segment, so
+    every branch is explored and the earliest table entry wins, exactly
+    as with sequential matching over ENDPOINT_ACTIONS.
+
+    Pass params=None to skip collecting parameter values.
+    """
+    if i == len(segments):
+        terminal = node.get(_TERMINAL)
+        return (terminal[0], terminal[1], params) if terminal else None
+
+    segment = segments[i]
+    best = None
+
+    child = node.get(segment)
+    if child is not None:
+        best = _walk_route(child, segments, i + 1, params)
+
+    if segment:
+        for (name, digits_only), child in node.get(_PARAMS, {}).items():
+            if digits_only and not segment.isdecimal():
+                continue
+            child_params = params + ((name, segment),) if params is not None else None
+            found = _walk_route(child, segments, i + 1, child_params)
+            if found and (best is None or found[0] < best[0]):
+                best = found
+
+    tails = node.get(_TAILS)
+    if tails:
+        rest = "/".join(segments[i:])
+        for name, allow_empty, index, actions in tails:
+            if (rest or allow_empty) and (best is None or index < best[0]):
+                tail_params = params + ((name, rest),) if params is not None else None
+                best = (index, actions, tail_params)
+
+    return best
+
+
+# Built once at import; match_endpoint/match_git_endpoint run on every request.
+# REST endpoints resolve with a few dict lookups per path segment; the handful
+# of git endpoints use a fused regex.
+_ENDPOINT_TRIES = _build_route_tries(ENDPOINT_ACTIONS)
+_GIT_ENDPOINT_BY_METHOD = _compile_by_method(GIT_ENDPOINT_ACTIONS)
+
+
 GRAPHQL_MUTATION_ACTIONS = {
     "addDiscussionComment": "discussions:comment_add",
 }
@@ -186,11 +357,13 @@ BUNDLE_EXPANSION = {
 
 # This will be populated by commands registering their actions
 _COMMAND_ACTIONS: list[str] = []
+_COMMAND_ACTIONS_SET: set[str] = set()
 
 def register_actions(actions: list[str]) -> None:
     """Register actions from a command module."""
     for action in actions:
-        if action not in _COMMAND_ACTIONS:
+        if action not in _COMMAND_ACTIONS_SET:
+            _COMMAND_ACTIONS_SET.add(action)
             _COMMAND_ACTIONS.append(action)
 
 def get_all_actions() -> list[str]:
@@ -248,35 +421,40 @@ ACTION_CATEGORIES = {
     "subissues": ["subissues:list", "subissues:parent", "subissues:add", "subissues:remove", "subissues:reprioritize"],
 }
 
+# Every valid action pattern -> its expansion. Later entries win, which
+# gives "*" precedence over bundles, bundles over "category:*", and those
+# over single actions.
+_EXPANSIONS: dict[str, tuple[str, ...]] = {
+    **{action: (action,) for action in ALL_ACTIONS},
+    **{f"{name}:*": tuple(actions) for name, actions in ACTION_CATEGORIES.items()},
+    **{name: tuple(actions) for name, actions in BUNDLE_EXPANSION.items()},
+    "*": tuple(ALL_ACTIONS),
+}
+_EXPANSION_SETS: dict[str, frozenset[str]] = {
+    pattern: frozenset(actions) for pattern, actions in _EXPANSIONS.items()
+}
+
 
 # =============================================================================
 # Policy Evaluation
 # =============================================================================
 
-def expand_action_pattern(pattern: str) -> list[str]:
+def expand_action_pattern(pattern: str) -> tuple[str, ...]:
     """
     Expand action pattern.
     - "*" → all actions
     - "issues:*" → issues:read, issues:write
     - "pull-requests:read" → layer 1 actions
     - "pr:list" → pr:list (layer 1 action as-is)
-    """
-    if pattern == "*":
-        return ALL_ACTIONS.copy()
 
-    if pattern in BUNDLE_EXPANSION:
-        return BUNDLE_EXPANSION[pattern].copy()
-
-    if pattern.endswith(":*"):
-        category = pattern[:-2]
-        if category in ACTION_CATEGORIES:
-            return ACTION_CATEGORIES[category].copy()
-        return []
+    The result is a shared tuple; unknown patterns expand to ().
+    """
+    return _EXPANSIONS.get(pattern, ())
 
-    if pattern in ALL_ACTIONS:
-        return [pattern]
 
-    return []
+def _expand_action_pattern_set(pattern: str) -> frozenset[str]:
+    """Set form of expand_action_pattern()."""
+    return _EXPANSION_SETS.get(pattern, frozenset())
 
 
 def expand_repo_pattern(pattern: str, repo: str) -> bool:
@@ -286,21 +464,120 @@ def expand_repo_pattern(pattern: str, repo: str) -> bool:
     - "owner/*" → all repos of owner
     - "owner/repo" → exact match
     """
-    pattern_lower = pattern.lower()
-    repo_lower = repo.lower()
+    return _repo_pattern_matches(pattern.lower(), repo.lower())
+
 
+def _repo_pattern_matches(pattern_lower: str, repo_lower: str) -> bool:
+    """expand_repo_pattern() for arguments the caller has already lowercased."""
     if pattern_lower == "*":
         return True
 
     if pattern_lower.endswith("/*"):
-        owner_pattern = pattern_lower[:-2]
-        repo_owner = repo_lower.split("/")[0]
-        return owner_pattern == repo_owner
+        return pattern_lower[:-2] == repo_lower.partition("/")[0]
+
+    if not any(c in pattern_lower for c in "*?["):
+        return pattern_lower == repo_lower
+
+    # Both sides are lowercase, so skip fnmatch()'s own case folding
+    return fnmatch.fnmatchcase(repo_lower, pattern_lower)
+
+
+class CompiledRule(NamedTuple):
+    """
+    A policy rule with its action and repo patterns expanded ahead of time.
+
+    repo_matches expects an already-lowercased repo name.
+    """
+
+    effect: str
+    actions: frozenset[str]
+    repo_matches: Callable[[str], bool]
+    rule: dict
+
 
-    return fnmatch.fnmatch(repo_lower, pattern_lower)
+def _compile_repo_patterns(patterns: list[str]) -> Callable[[str], bool]:
+    """
+    Build a predicate equivalent to any(expand_repo_pattern(p, repo) for p in patterns),
+    taking the repo name already lowercased.
+
+    Patterns are bucketed once: "*", exact names, "owner/*" owners, and
+    real globs fused into a single regex.
+    """
+    exact = set()
+    owners = set()
+    globs = []
+    for pattern in patterns:
+        pattern_lower = pattern.lower()
+        if pattern_lower == "*":
+            return lambda repo: True
+        if pattern_lower.endswith("/*"):
+            owners.add(pattern_lower[:-2])
+        elif any(c in pattern_lower for c in "*?["):
+            globs.append(fnmatch.translate(pattern_lower))
+        else:
+            exact.add(pattern_lower)
+
+    exact = frozenset(exact)
+    owners = frozenset(owners)
+    glob_match = re.compile("|".join(globs)).match if globs else None
+
+    def repo_matches(repo_lower: str) -> bool:
+        return (
+            repo_lower in exact
+            or (owners and repo_lower.partition("/")[0] in owners)
+            or (glob_match is not None and glob_match(repo_lower) is not None)
+        )
+
+    return repo_matches
+
+
+def compile_rules(rules: list[dict]) -> list[CompiledRule]:
+    """Pre-expand rules so evaluate_policy does no pattern work per request."""
+    compiled = []
+    for rule in rules:
+        actions = frozenset().union(
+            *(_expand_action_pattern_set(p) for p in rule.get("actions", []))
+        )
+        compiled.append(CompiledRule(
+            effect=rule.get("effect", "").lower(),
+            actions=actions,
+            repo_matches=_compile_repo_patterns(rule.get("repos", [])),
+            rule=rule,
+        ))
+    return compiled
+
+
+class RuleIndex(NamedTuple):
+    """Compiled rules bucketed by effect and concrete action, in config order."""
+
+    deny: dict[str, list[CompiledRule]]
+    allow: dict[str, list[CompiledRule]]
+
+
+def index_rules(rules: list[CompiledRule]) -> RuleIndex:
+    """
+    Index compiled rules by the actions they cover.
+
+    Action patterns ("*", bundles, categories) are already expanded to
+    concrete actions, so every rule lands in the bucket of each action it
+    grants or denies; no separate wildcard bucket is needed.
+    """
+    index = RuleIndex(deny={}, allow={})
+    for rule in rules:
+        if rule.effect == "deny":
+            buckets = index.deny
+        elif rule.effect == "allow":
+            buckets = index.allow
+        else:
+            continue
+        for action in rule.actions:
+            buckets.setdefault(action, []).append(rule)
+    return index
 
 
-def evaluate_policy(action: str, repo: str, rules: list[dict]) -> tuple[bool, str]:
+def evaluate_policy(
+    action: str, repo: str, rules: list[dict] | list[CompiledRule] | RuleIndex
+) -> tuple[bool, str]:
     """
     AWS IAM-style policy evaluation.
 
@@ -309,107 +586,138 @@ def evaluate_policy(action: str, repo: str, rules: list[dict]) -> tuple[bool, st
     2. Any deny match → reject (deny always wins)
     3. Any allow match → allow
     4. No match → reject
+
+    rules may be raw config rules, the output of compile_rules(), or a
+    RuleIndex (load_config stores one as config["rule_index"]). Only rules
+    that mention the action are looked at, denies first.
     """
-    has_allow = False
+    rules = _as_rule_index(rules)
+    repo_lower = repo.lower()
 
-    for rule in rules:
-        effect = rule.get("effect", "").lower()
-        actions = rule.get("actions", [])
-        repos = rule.get("repos", [])
-
-        action_match = False
-        for action_pattern in actions:
-            expanded = expand_action_pattern(action_pattern)
-            if action in expanded:
-                action_match = True
-                break
-
-        if not action_match:
-            continue
+    for rule in rules.deny.get(action, ()):
+        if rule.repo_matches(repo_lower):
+            return False, f"Denied by rule: {rule.rule}"
 
-        repo_match = False
-        for repo_pattern in repos:
-            if expand_repo_pattern(repo_pattern, repo):
-                repo_match = True
-                break
+    for rule in rules.allow.get(action, ()):
+        if rule.repo_matches(repo_lower):
+            return True, "Allowed"
 
-        if not repo_match:
-            continue
+    return False, f"No matching allow rule for {action} on {repo}"
 
-        if effect == "deny":
-            return False, f"Denied by rule: {rule}"
-        elif effect == "allow":
-            has_allow = True
 
-    if has_allow:
-        return True, "Allowed"
-    else:
-        return False, f"No matching allow rule for {action} on {repo}"
+def evaluate_policy_any(
+    actions: tuple[str, ...], repo: str, rules: list[dict] | list[CompiledRule] | RuleIndex
+) -> tuple[bool, str]:
+    """
+    Evaluate a request that maps to several actions (see match_endpoint_actions).
+
+    A deny on any of the actions rejects; otherwise an allow on any of
+    them allows.
+    """
+    rules = _as_rule_index(rules)
+    repo_lower = repo.lower()
+
+    for action in actions:
+        for rule in rules.deny.get(action, ()):
+            if rule.repo_matches(repo_lower):
+                return False, f"Denied by rule: {rule.rule}"
+
+    for action in actions:
+        for rule in rules.allow.get(action, ()):
+            if rule.repo_matches(repo_lower):
+                return True, "Allowed"
+
+    return False, f"No matching allow rule for {' / '.join(actions)} on {repo}"
+
+
+def _as_rule_index(rules: list[dict] | list[CompiledRule] | RuleIndex) -> RuleIndex:
+    """Compile and index rules unless they already are a RuleIndex."""
+    if isinstance(rules, RuleIndex):
+        return rules
+    if rules and not isinstance(rules[0], CompiledRule):
+        rules = compile_rules(rules)
+    return index_rules(rules)
 
 
 # =============================================================================
 # Parameter Branching
 # =============================================================================
 
+def _resolve_pr_create(body_json: dict) -> str:
+    if body_json.get("draft", False):
+        return "pr:create_draft"
+    return "pr:create"
+
+
+def _resolve_pr_update(body_json: dict) -> str:
+    state = body_json.get("state")
+    draft = body_json.get("draft")
+    if state == "closed":
+        return "pr:close"
+    if state == "open":
+        return "pr:reopen"
+    if draft is True:
+        return "pr:convert_to_draft"
+    if draft is False:
+        return "pr:mark_ready"
+    return "pr:update"
+
+
+def _resolve_pr_merge(body_json: dict) -> str:
+    merge_method = body_json.get("merge_method", "merge")
+    if merge_method == "squash":
+        return "pr:merge_squash"
+    if merge_method == "rebase":
+        return "pr:merge_rebase"
+    return "pr:merge_commit"
+
+
+def _resolve_pr_review(body_json: dict) -> str:
+    event = body_json.get("event", "").upper()
+    if event == "APPROVE":
+        return "pr:approve"
+    if event == "REQUEST_CHANGES":
+        return "pr:request_changes"
+    if event == "COMMENT":
+        return "pr:review_comment_only"
+    return "pr:review_pending"
+
+
+def _resolve_pr_review_submit(body_json: dict) -> str:
+    event = body_json.get("event", "").upper()
+    if event == "APPROVE":
+        return "pr:review_submit_approve"
+    if event == "REQUEST_CHANGES":
+        return "pr:review_submit_request_changes"
+    return "pr:review_submit_comment"
+
+
+_PARAM_BRANCH_RESOLVERS = {
+    "pr:create_PARAM_BRANCH": _resolve_pr_create,
+    "pr:update_PARAM_BRANCH": _resolve_pr_update,
+    "pr:merge_PARAM_BRANCH": _resolve_pr_merge,
+    "pr:review_PARAM_BRANCH": _resolve_pr_review,
+    "pr:review_submit_PARAM_BRANCH": _resolve_pr_review_submit,
+}
+
+
 def resolve_param_branch(action: str, body: bytes | None) -> str:
     """
     Resolve _PARAM_BRANCH marked actions based on request body.
     """
-    if "_PARAM_BRANCH" not in action:
-        return action
+    resolver = _PARAM_BRANCH_RESOLVERS.get(action)
+    if resolver is None:
+        # Plain action (replace() is a no-op), or a branch marker without a resolver
+        return action.replace("_PARAM_BRANCH", "")
 
     body_json = {}
     if body:
         try:
-            body_json = json.loads(body.decode("utf-8"))
-        except (json.JSONDecodeError, UnicodeDecodeError):
+            body_json = loads(body)
+        except JSONDecodeError:
             pass
 
-    if action == "pr:create_PARAM_BRANCH":
-        if body_json.get("draft", False):
-            return "pr:create_draft"
-        return "pr:create"
-
-    if action == "pr:update_PARAM_BRANCH":
-        state = body_json.get("state")
-        draft = body_json.get("draft")
-        if state == "closed":
-            return "pr:close"
-        if state == "open":
-            return "pr:reopen"
-        if draft is True:
-            return "pr:convert_to_draft"
-        if draft is False:
-            return "pr:mark_ready"
-        return "pr:update"
-
-    if action == "pr:merge_PARAM_BRANCH":
-        merge_method = body_json.get("merge_method", "merge")
-        if merge_method == "squash":
-            return "pr:merge_squash"
-        if merge_method == "rebase":
-            return "pr:merge_rebase"
-        return "pr:merge_commit"
-
-    if action == "pr:review_PARAM_BRANCH":
-        event = body_json.get("event", "").upper()
-        if event == "APPROVE":
-            return "pr:approve"
-        if event == "REQUEST_CHANGES":
-            return "pr:request_changes"
-        if event == "COMMENT":
-            return "pr:review_comment_only"
-        return "pr:review_pending"
-
-    if action == "pr:review_submit_PARAM_BRANCH":
-        event = body_json.get("event", "").upper()
-        if event == "APPROVE":
-            return "pr:review_submit_approve"
-        if event == "REQUEST_CHANGES":
-            return "pr:review_submit_request_changes"
-        return "pr:review_submit_comment"
-
-    return action.replace("_PARAM_BRANCH", "")
+    return resolver(body_json)
 
 
 # =============================================================================
@@ -418,35 +726,67 @@ def resolve_param_branch(action: str, body: bytes | None) -> str:
 
 def match_endpoint(method: str, path: str) -> tuple[str | None, dict]:
     """Match REST API endpoint to action."""
-    for allowed_method, pattern, action in ENDPOINT_ACTIONS:
-        if method != allowed_method:
-            continue
-        match = re.match(pattern, path)
-        if match:
-            return action, match.groupdict()
-    return None, {}
+    root = _ENDPOINT_TRIES.get(method)
+    if root is None or not path.startswith("/"):
+        return None, {}
+    found = _walk_route(root, path[1:].split("/"), 0, ())
+    if found is None:
+        return None, {}
+    return found[1][0], dict(found[2])
+
+
+def match_endpoint_actions(method: str, path: str) -> tuple[tuple[str, ...], dict]:
+    """
+    Match REST API endpoint to every action mapped to it.
+
+    A route listed more than once in ENDPOINT_ACTIONS (e.g. GET
+    issues/{n}/comments, which is both issues:read and pr:comment_list)
+    yields all of its actions in table order; match_endpoint only
+    returns the first. Check the result with evaluate_policy_any().
+    """
+    root = _ENDPOINT_TRIES.get(method)
+    if root is None or not path.startswith("/"):
+        return (), {}
+    found = _walk_route(root, path[1:].split("/"), 0, ())
+    if found is None:
+        return (), {}
+    return found[1], dict(found[2])
+
+
+def match_endpoint_action(method: str, path: str) -> str | None:
+    """
+    Match REST API endpoint to action without extracting path parameters.
+
+    Same result as match_endpoint(method, path)[0], for callers that only
+    need the action for a policy decision.
+    """
+    root = _ENDPOINT_TRIES.get(method)
+    if root is None or not path.startswith("/"):
+        return None
+    found = _walk_route(root, path[1:].split("/"), 0, None)
+    return found[1][0] if found else None
 
 
 def match_git_endpoint(method: str, path: str, query: str) -> tuple[str | None, dict]:
     """Match git smart HTTP endpoint to action."""
-    for allowed_method, pattern, action in GIT_ENDPOINT_ACTIONS:
-        if method != allowed_method:
-            continue
-        match = re.match(pattern, path)
-        if match:
-            if path.endswith("/info/refs"):
-                if "service=git-receive-pack" in query:
-                    return "git:write", match.groupdict()
-                else:
-                    return "git:read", match.groupdict()
-            return action, match.groupdict()
-    return None, {}
+    action, params = _match_fused(_GIT_ENDPOINT_BY_METHOD, method, path)
+    if action and path.endswith("/info/refs"):
+        if "service=git-receive-pack" in query:
+            return "git:write", params
+        else:
+            return "git:read", params
+    return action, params
 
 
 # =============================================================================
 # PAT Selection
 # =============================================================================
 
+# (config, memoized selector) for the config select_pat() last saw. The
+# config object is held, so a reloaded config never matches by accident.
+_PAT_SELECTOR: tuple[dict, Callable[[str], str | None]] | None = None
+
+
 def select_pat(repo: str, config: dict) -> str:
     """
     Select appropriate PAT for repository.
@@ -464,19 +804,34 @@ def select_pat(repo: str, config: dict) -> str:
       "classic_pat": "ghp_xxx",
       "fine_grained_pats": [...]
     }
+
+    Results are cached per repo for as long as the same config object is
+    passed in; load_config() returns a new object when the file changes.
     """
+    global _PAT_SELECTOR
+    selector = _PAT_SELECTOR
+    if selector is None or selector[0] is not config:
+        selector = (config, lru_cache(maxsize=1024)(lambda r: _select_pat(r, config)))
+        _PAT_SELECTOR = selector
+    return selector[1](repo)
+
+
+def _select_pat(repo: str, config: dict) -> str:
+    """select_pat() without the cache."""
+    repo_lower = repo.lower()
+
     # New format: pats array
     if "pats" in config:
         for pat_entry in config["pats"]:
             for repo_pattern in pat_entry.get("repos", []):
-                if expand_repo_pattern(repo_pattern, repo):
+                if _repo_pattern_matches(repo_pattern.lower(), repo_lower):
                     return pat_entry["token"]
         return None  # No matching PAT
 
     # Legacy format: fine_grained_pats + classic_pat fallback
     for fg_pat in config.get("fine_grained_pats", []):
         for repo_pattern in fg_pat.get("repos", []):
-            if expand_repo_pattern(repo_pattern, repo):
+            if _repo_pattern_matches(repo_pattern.lower(), repo_lower):
                 return fg_pat["pat"]
     return config.get("classic_pat")
 
@@ -485,6 +840,10 @@ def select_pat(repo: str, config: dict) -> str:
 # Config Loading
 # =============================================================================
 
+# Parsed configs keyed by path, reused while (mtime_ns, size) is unchanged
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
 def load_config(config_path: Path) -> dict:
     """Load and validate config file."""
     if not config_path.exists():
@@ -508,63 +867,90 @@ EOF""", file=sys.stderr)
         print(f"Run: chmod 600 {config_path}", file=sys.stderr)
         sys.exit(1)
 
+    cache_key = str(config_path)
+    version = (stat_info.st_mtime_ns, stat_info.st_size)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    config = _validate_config(_parse_config(config_path.read_bytes()))
+    _CONFIG_CACHE[cache_key] = (version, config)
+    return config
+
+
+def _parse_config(raw: bytes) -> dict:
+    """Parse config bytes: strict JSON first, JSON5 only if that fails."""
+    try:
+        return loads(raw)
+    except JSONDecodeError:
+        pass
+
+    # Comments, trailing commas, etc. need the (much slower) JSON5 parser
     try:
-        with open(config_path) as f:
-            config = json5.load(f)
+        return json5.loads(raw.decode("utf-8"))
     except ValueError as e:
         print(f"Error: Invalid JSON5 in config file: {e}", file=sys.stderr)
         sys.exit(1)
 
+
+# Required fields per list entry, checked in order:
+# (key, required type or None for presence only, allowed values or None)
+_PAT_ENTRY_FIELDS = (("token", None, None), ("repos", list, None))
+_FINE_GRAINED_PAT_FIELDS = (("pat", None, None), ("repos", list, None))
+_RULE_FIELDS = (
+    ("effect", None, ("allow", "deny")),
+    ("actions", list, None),
+    ("repos", list, None),
+)
+
+
+def _config_error(message: str) -> None:
+    print(f"Error: {message}", file=sys.stderr)
+    sys.exit(1)
+
+
+def _check_entries(entries: list, label: str, fields: tuple) -> None:
+    """Check every entry of a config list against a _*_FIELDS table."""
+    for i, entry in enumerate(entries):
+        where = label.format(i=i)
+        if not isinstance(entry, dict):
+            _config_error(f"{where} must be an object")
+        for key, expected_type, choices in fields:
+            if expected_type is None:
+                if key not in entry:
+                    _config_error(f"{where} missing '{key}'")
+            elif not isinstance(entry.get(key), expected_type):
+                _config_error(f"{where} missing or invalid '{key}'")
+            if choices is not None and entry[key] not in choices:
+                allowed = " or ".join(f"'{c}'" for c in choices)
+                _config_error(f"{where} {key} must be {allowed}")
+
+
+def _validate_config(config: dict) -> dict:
+    """Validate a parsed config, fill in defaults and compile its rules."""
     # New format: pats array
     if "pats" in config:
         if not isinstance(config["pats"], list) or len(config["pats"]) == 0:
-            print("Error: pats must be a non-empty list", file=sys.stderr)
-            sys.exit(1)
-        for i, pat_entry in enumerate(config["pats"]):
-            if "token" not in pat_entry:
-                print(f"Error: pats[{i}] missing 'token'", file=sys.stderr)
-                sys.exit(1)
-            if "repos" not in pat_entry or not isinstance(pat_entry["repos"], list):
-                print(f"Error: pats[{i}] missing or invalid 'repos'", file=sys.stderr)
-                sys.exit(1)
+            _config_error("pats must be a non-empty list")
+        _check_entries(config["pats"], "pats[{i}]", _PAT_ENTRY_FIELDS)
         return config
 
     # Legacy format: classic_pat + fine_grained_pats + rules
     if "classic_pat" not in config:
-        print("Error: Missing required field: classic_pat (or use new 'pats' format)", file=sys.stderr)
-        sys.exit(1)
+        _config_error("Missing required field: classic_pat (or use new 'pats' format)")
 
     if "fine_grained_pats" in config:
         if not isinstance(config["fine_grained_pats"], list):
-            print("Error: fine_grained_pats must be a list", file=sys.stderr)
-            sys.exit(1)
-        for i, fg_pat in enumerate(config["fine_grained_pats"]):
-            if "pat" not in fg_pat:
-                print(f"Error: fine_grained_pats[{i}] missing 'pat'", file=sys.stderr)
-                sys.exit(1)
-            if "repos" not in fg_pat or not isinstance(fg_pat["repos"], list):
-                print(f"Error: fine_grained_pats[{i}] missing or invalid 'repos'", file=sys.stderr)
-                sys.exit(1)
+            _config_error("fine_grained_pats must be a list")
+        _check_entries(config["fine_grained_pats"], "fine_grained_pats[{i}]", _FINE_GRAINED_PAT_FIELDS)
     else:
         config["fine_grained_pats"] = []
 
     # rules is optional in legacy format (for backward compatibility during transition)
     if "rules" in config:
         if not isinstance(config["rules"], list):
-            print("Error: rules must be a list", file=sys.stderr)
-            sys.exit(1)
-        for i, rule in enumerate(config["rules"]):
-            if "effect" not in rule:
-                print(f"Error: Rule {i} missing 'effect'", file=sys.stderr)
-                sys.exit(1)
-            if rule["effect"] not in ["allow", "deny"]:
-                print(f"Error: Rule {i} effect must be 'allow' or 'deny'", file=sys.stderr)
-                sys.exit(1)
-            if "actions" not in rule or not isinstance(rule["actions"], list):
-                print(f"Error: Rule {i} missing or invalid 'actions'", file=sys.stderr)
-                sys.exit(1)
-            if "repos" not in rule or not isinstance(rule["repos"], list):
-                print(f"Error: Rule {i} missing or invalid 'repos'", file=sys.stderr)
-                sys.exit(1)
+            _config_error("rules must be a list")
+        _check_entries(config["rules"], "Rule {i}", _RULE_FIELDS)
+        config["rule_index"] = index_rules(compile_rules(config["rules"]))
 
     return config
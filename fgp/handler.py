@@ -3,14 +3,20 @@ HTTP request handler for fgp proxy.
 """
 
 import base64
-import json
+import hashlib
 import os
+import shutil
 import subprocess
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from http.server import BaseHTTPRequestHandler
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from urllib.parse import parse_qs, urlparse
 from urllib.error import HTTPError, URLError
 
+from .core.cache import TTLCache
+from .core.http import GITHUB_API_HEADERS, StreamedResponse, request, stream
+from .core.jsonutil import JSONDecodeError, dumps, loads
 from .core.policy import (
     match_git_endpoint,
     select_pat,
@@ -18,11 +24,48 @@ from .core.policy import (
 from .commands import execute_command, COMMAND_MODULES
 
 
+# Chunk size for relaying git request and response bodies
+_GIT_CHUNK_SIZE = 64 * 1024
+
+# /auth/status results per PAT. Validity changes on the order of hours, so a
+# short TTL keeps dashboards that poll the endpoint off api.github.com.
+# Keys hold a digest of the token, never the token itself.
+_PAT_STATUS_CACHE = TTLCache(maxsize=256, ttl=60)
+_PAT_STATUS_WORKERS = 8
+
+# Environment for gh subprocesses minus GH_TOKEN, built on first use
+_GH_ENV_BASE: dict[str, str] | None = None
+
+
+def _gh_env(pat: str) -> dict[str, str]:
+    """Environment for a gh subprocess authenticated with pat."""
+    global _GH_ENV_BASE
+    if _GH_ENV_BASE is None:
+        _GH_ENV_BASE = {
+            **os.environ,
+            "GH_HOST": "github.com",
+            "GH_FORCE_TTY": "1",
+            "NO_COLOR": "1",
+        }
+    return _GH_ENV_BASE | {"GH_TOKEN": pat}
+
+
+@lru_cache(maxsize=64)
+def _git_basic_auth(pat: str) -> str:
+    """Authorization header value for git smart HTTP (fixed per PAT)."""
+    credentials = base64.b64encode(f"x-access-token:{pat}".encode()).decode()
+    return f"Basic {credentials}"
+
+
 class GitHubProxyHandler(BaseHTTPRequestHandler):
     """GitHub API and git smart HTTP proxy handler."""
 
     config: dict = {}
 
+    # Buffer writes so the status line, headers and a small body go out in
+    # one send(); handle_one_request() flushes after each request.
+    wbufsize = 64 * 1024
+
     def log_message(self, format, *args):
         print(f"[{self.log_date_time_string()}] {format % args}")
 
@@ -31,94 +74,124 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
         parsed = urlparse(self.path)
         path = parsed.path
 
-        if path.startswith("/git/"):
-            self.handle_git_request(method)
-        elif path == "/cli":
-            self.handle_cli_request(method)
-        elif path == "/auth/status":
-            self.handle_auth_status(method)
-        else:
-            self.send_error(404, f"Unknown endpoint: {path}")
+        segment, sep, _ = path[1:].partition("/")
+        route = self._ROUTES.get(segment)
+        if route is not None:
+            handler, exact_path = route
+            if path == exact_path if exact_path is not None else sep:
+                handler(self, method)
+                return
+
+        self.send_error(404, f"Unknown endpoint: {path}")
 
     # =========================================================================
     # /auth/status endpoint
     # =========================================================================
 
     def handle_auth_status(self, method: str):
-        """Check authentication status for all configured PATs."""
+        """
+        Check authentication status for all configured PATs.
+
+        The response is compact JSON; add ?pretty to get it indented.
+        """
         if method != "GET":
             self.send_error(405, "Only GET is allowed")
             return
 
-        # New format: pats array
-        if "pats" in self.config:
-            result = {"pats": []}
-            for pat_entry in self.config["pats"]:
-                status = self._check_pat_status(
-                    pat_entry["token"],
-                    pat_type="auto",  # Will detect from token prefix
-                    repos=pat_entry.get("repos", [])
-                )
-                result["pats"].append(status)
-        else:
-            # Legacy format
-            result = {
-                "classic_pat": self._check_pat_status(
+        # Each check is an API round-trip, so run them in parallel
+        with ThreadPoolExecutor(max_workers=_PAT_STATUS_WORKERS) as executor:
+            # New format: pats array
+            if "pats" in self.config:
+                result = {"pats": list(executor.map(
+                    lambda pat_entry: self._check_pat_status(
+                        pat_entry["token"],
+                        pat_type="auto",  # Will detect from token prefix
+                        repos=pat_entry.get("repos", [])
+                    ),
+                    self.config["pats"],
+                ))}
+            else:
+                # Legacy format
+                classic = executor.submit(
+                    self._check_pat_status,
                     self.config["classic_pat"],
                     pat_type="classic"
-                ),
-                "fine_grained_pats": [],
-            }
-            for fg_pat in self.config.get("fine_grained_pats", []):
-                status = self._check_pat_status(
-                    fg_pat["pat"],
-                    pat_type="fine_grained",
-                    repos=fg_pat.get("repos", [])
                 )
-                result["fine_grained_pats"].append(status)
+                fine_grained = executor.map(
+                    lambda fg_pat: self._check_pat_status(
+                        fg_pat["pat"],
+                        pat_type="fine_grained",
+                        repos=fg_pat.get("repos", [])
+                    ),
+                    self.config.get("fine_grained_pats", []),
+                )
+                result = {
+                    "classic_pat": classic.result(),
+                    "fine_grained_pats": list(fine_grained),
+                }
 
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
-        self.wfile.write(json.dumps(result, indent=2).encode("utf-8"))
+        query = parse_qs(urlparse(self.path).query, keep_blank_values=True)
+        self.wfile.write(dumps(result, indent="pretty" in query))
 
     def _check_pat_status(
         self, pat: str, pat_type: str, repos: list[str] | None = None
     ) -> dict:
-        """Validate a PAT by calling GitHub API /user endpoint."""
+        """Validate a PAT, reusing a recent result for the same PAT if there is one."""
+        key = (
+            hashlib.blake2b(pat.encode(), digest_size=16).hexdigest(),
+            pat_type,
+            tuple(repos or ()),
+        )
+        cached = _PAT_STATUS_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        result, cacheable = self._fetch_pat_status(pat, pat_type, repos)
+        if cacheable:
+            _PAT_STATUS_CACHE[key] = result
+        return result
+
+    def _fetch_pat_status(
+        self, pat: str, pat_type: str, repos: list[str] | None = None
+    ) -> tuple[dict, bool]:
+        """
+        Validate a PAT by calling GitHub API /user endpoint.
+
+        Returns:
+            (status dict, whether it is worth caching). Connection failures
+            are not cached so they are retried on the next request.
+        """
         if len(pat) > 12:
             masked = f"{pat[:4]}...{pat[-4:]}"
         else:
             masked = "****"
 
         try:
-            req = Request(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"Bearer {pat}",
-                    "Accept": "application/vnd.github+json",
-                    "User-Agent": "fgp-proxy",
-                    "X-GitHub-Api-Version": "2022-11-28",
-                },
+            _, headers, data = request(
+                "GET", "https://api.github.com/user",
+                headers={**GITHUB_API_HEADERS, "Authorization": f"Bearer {pat}"},
+                timeout=10,
             )
-            with urlopen(req, timeout=10) as resp:
-                user_data = json.loads(resp.read().decode("utf-8"))
-                scopes = resp.headers.get("X-OAuth-Scopes", "")
+            user_data = loads(data)
+            scopes = headers.get("X-OAuth-Scopes", "")
 
-                result = {
-                    "valid": True,
-                    "masked_token": masked,
-                    "user": user_data.get("login"),
-                    "type": pat_type,
-                }
+            result = {
+                "valid": True,
+                "masked_token": masked,
+                "user": user_data.get("login"),
+                "type": pat_type,
+            }
 
-                if pat_type == "classic":
-                    result["scopes"] = [s.strip() for s in scopes.split(",") if s.strip()]
-                else:
-                    result["repos"] = repos or []
+            if pat_type == "classic":
+                result["scopes"] = [s.strip() for s in scopes.split(",") if s.strip()]
+            else:
+                result["repos"] = repos or []
 
-                return result
+            return result, True
 
         except HTTPError as e:
             return {
@@ -127,7 +200,7 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
                 "type": pat_type,
                 "error": f"HTTP {e.code}: {e.reason}",
                 "repos": repos if pat_type == "fine_grained" else None,
-            }
+            }, e.code < 500
         except URLError as e:
             return {
                 "valid": False,
@@ -135,7 +208,7 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
                 "type": pat_type,
                 "error": str(e.reason),
                 "repos": repos if pat_type == "fine_grained" else None,
-            }
+            }, False
         except Exception as e:
             return {
                 "valid": False,
@@ -143,7 +216,7 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
                 "type": pat_type,
                 "error": str(e),
                 "repos": repos if pat_type == "fine_grained" else None,
-            }
+            }, False
 
     # =========================================================================
     # /cli endpoint
@@ -163,8 +236,8 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
         body = self.rfile.read(content_length)
 
         try:
-            data = json.loads(body.decode("utf-8"))
-        except json.JSONDecodeError:
+            data = loads(body)
+        except JSONDecodeError:
             self.send_error(400, "Invalid JSON in request body")
             return
 
@@ -204,7 +277,7 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
             self.send_header("Content-Type", "application/json")
             self.send_header("Access-Control-Allow-Origin", "*")
             self.end_headers()
-            self.wfile.write(json.dumps(result).encode("utf-8"))
+            self.wfile.write(dumps(result))
 
         except ValueError as e:
             self.send_error(400, str(e))
@@ -224,13 +297,7 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
             capture_output=True,
             text=True,
             timeout=60,
-            env={
-                **os.environ,
-                "GH_TOKEN": pat,
-                "GH_HOST": "github.com",
-                "GH_FORCE_TTY": "1",
-                "NO_COLOR": "1",
-            }
+            env=_gh_env(pat),
         )
 
         return {
@@ -265,42 +332,90 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
             self.send_error(403, f"No PAT configured for repository: {full_repo}")
             return
 
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length) if content_length > 0 else None
+        # Pack data can be tens of MB, so bodies are relayed in chunks in
+        # both directions instead of being buffered whole
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = self._iter_chunked_body()
+            body_length = None
+        else:
+            body_length = int(self.headers.get("Content-Length", 0))
+            body = self._iter_body(body_length) if body_length > 0 else None
 
+        headers_sent = False
         try:
-            response_data, response_headers, status_code = self.proxy_git_to_github(
-                method, owner, repo, path, query, body, pat
-            )
-            self.send_response(status_code)
-            if "Content-Type" in response_headers:
-                self.send_header("Content-Type", response_headers["Content-Type"])
-            if "Cache-Control" in response_headers:
-                self.send_header("Cache-Control", response_headers["Cache-Control"])
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.end_headers()
-            self.wfile.write(response_data)
+            with self.proxy_git_to_github(
+                method, owner, repo, path, query, body, body_length, pat
+            ) as response:
+                self.send_response(response.status)
+                for name in ("Content-Type", "Cache-Control", "Content-Length"):
+                    if name in response.headers:
+                        self.send_header(name, response.headers[name])
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                headers_sent = True
+
+                shutil.copyfileobj(response, self.wfile, _GIT_CHUNK_SIZE)
         except HTTPError as e:
             error_body = e.read().decode("utf-8", errors="replace")
             self.send_error(e.code, f"{e.reason}: {error_body[:200]}")
         except URLError as e:
             self.send_error(502, f"Failed to connect to GitHub: {e.reason}")
         except Exception as e:
-            self.send_error(500, str(e))
+            if headers_sent:
+                # Too late for an error response; drop the connection instead
+                self.log_error("git relay failed mid-response: %s", e)
+                self.close_connection = True
+            else:
+                self.send_error(500, str(e))
+
+    def _iter_body(self, length: int):
+        """Yield a Content-Length delimited request body in chunks."""
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(_GIT_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    def _iter_chunked_body(self):
+        """Yield a Transfer-Encoding: chunked request body, decoded."""
+        while True:
+            size_line = self.rfile.readline(1024)
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Skip trailers up to the terminating empty line
+                while self.rfile.readline(1024) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            yield from self._iter_body(size)
+            self.rfile.readline(1024)  # CRLF after each chunk
 
     def proxy_git_to_github(
-        self, method: str, owner: str, repo: str, path: str, query: str, body: bytes | None, pat: str
-    ) -> tuple[bytes, dict, int]:
-        """Proxy git smart HTTP to GitHub."""
+        self,
+        method: str,
+        owner: str,
+        repo: str,
+        path: str,
+        query: str,
+        body: Iterator[bytes] | None,
+        body_length: int | None,
+        pat: str,
+    ) -> StreamedResponse:
+        """
+        Proxy git smart HTTP to GitHub.
+
+        body is sent as it is read from the client (with Content-Length if
+        body_length is known, chunked otherwise). The returned response is
+        unread; the caller relays it and closes it.
+        """
         git_path = path.replace(f"/git/{owner}/{repo}.git", f"/{owner}/{repo}.git")
         url = f"https://github.com{git_path}"
         if query:
             url += f"?{query}"
 
-        credentials = base64.b64encode(f"x-access-token:{pat}".encode()).decode()
-
         headers = {
-            "Authorization": f"Basic {credentials}",
+            "Authorization": _git_basic_auth(pat),
             "User-Agent": "git/2.40.0",
         }
 
@@ -313,11 +428,18 @@ class GitHubProxyHandler(BaseHTTPRequestHandler):
         if self.headers.get("Content-Encoding"):
             headers["Content-Encoding"] = self.headers.get("Content-Encoding")
 
-        req = Request(url, data=body, headers=headers, method=method)
+        if body_length is not None and body is not None:
+            headers["Content-Length"] = str(body_length)
+
+        return stream(method, url, data=body, headers=headers, timeout=60)
 
-        with urlopen(req, timeout=60) as response:
-            response_headers = {k: v for k, v in response.headers.items()}
-            return response.read(), response_headers, response.status
+    # First path segment -> (handler, exact path required, or None to
+    # accept anything under /<segment>/)
+    _ROUTES = {
+        "git": (handle_git_request, None),
+        "cli": (handle_cli_request, "/cli"),
+        "auth": (handle_auth_status, "/auth/status"),
+    }
 
     # =========================================================================
     # HTTP method handlers
@@ -3,7 +3,7 @@ HTTP server for fgp proxy.
 """
 
 import argparse
-from http.server import HTTPServer
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 
 from .core.policy import (
@@ -37,7 +37,10 @@ def main():
     config = load_config(args.config)
     GitHubProxyHandler.config = config
 
-    server = HTTPServer(("0.0.0.0", args.port), GitHubProxyHandler)
+    # One thread per connection so slow upstream calls (git clones, GitHub
+    # API round-trips) don't block other clients
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), GitHubProxyHandler)
+    server.daemon_threads = True
     print(f"GitHub Proxy listening on http://0.0.0.0:{args.port}")
     print(f"Config: {args.config}")
 
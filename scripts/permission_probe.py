@@ -10,30 +10,269 @@ Usage:
 
     # または gh auth で認証済みなら
     python scripts/permission_probe.py --repo owner/repo
+
+GitHub API には直接 HTTPS で接続し、接続を使い回す (gh の起動は gh auth token の 1 回だけ)。
+トークンが取れない場合は従来どおり gh api graphql を呼ぶ。
+Repository スキーマの introspection 結果は 1 日キャッシュする (--refresh-schema で取り直し)。
 """
 
+import atexit
 import json
+import os
+import random
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from http.client import HTTPException, HTTPMessage, HTTPSConnection
+from pathlib import Path
 from typing import Any
 
-
-def run_graphql_query(query: str) -> dict[str, Any]:
-    """gh api graphql を使ってクエリを実行"""
-    result = subprocess.run(
-        ["gh", "api", "graphql", "-f", f"query={query}"],
-        capture_output=True,
-        text=True,
+# orjson があれば使う (なくても動く)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# tqdm があれば進捗バーを出す (なければバッチごとにまとめて表示)
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+GRAPHQL_HOST = "api.github.com"
+
+# スレッドごとに使い回す keep-alive 接続と認証トークン (初回のクエリで用意する)
+_local = threading.local()
+_all_connections: list[HTTPSConnection] = []
+_connections_lock = threading.Lock()
+_token: str | None = None
+_token_resolved = False
+
+
+def json_loads(data: bytes | str) -> Any:
+    """JSON をパース (orjson.JSONDecodeError は json.JSONDecodeError のサブクラス)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """JSON を UTF-8 の bytes にする (indent=True なら 2 スペースで整形)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def get_token() -> str | None:
+    """GH_TOKEN、なければ gh auth token からトークンを取得 (取れなければ None)"""
+    global _token, _token_resolved
+    if not _token_resolved:
+        _token_resolved = True
+        _token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+        if not _token:
+            try:
+                result = subprocess.run(
+                    ["gh", "auth", "token"], capture_output=True, text=True
+                )
+                _token = result.stdout.strip() or None
+            except OSError:
+                _token = None
+    return _token
+
+
+def _get_connection() -> HTTPSConnection:
+    """このスレッドの接続 (なければ作る)"""
+    conn = getattr(_local, "connection", None)
+    if conn is None:
+        conn = HTTPSConnection(GRAPHQL_HOST, timeout=30)
+        _local.connection = conn
+        with _connections_lock:
+            _all_connections.append(conn)
+    return conn
+
+
+def _close_connection() -> None:
+    """このスレッドの接続を閉じる (次回は張り直す)"""
+    conn = getattr(_local, "connection", None)
+    if conn is not None:
+        conn.close()
+        _local.connection = None
+        with _connections_lock:
+            _all_connections.remove(conn)
+
+
+@atexit.register
+def _close_all_connections() -> None:
+    with _connections_lock:
+        for conn in _all_connections:
+            conn.close()
+        _all_connections.clear()
+
+
+def _post_graphql(body: bytes, token: str) -> tuple[int, HTTPMessage, bytes]:
+    """keep-alive 接続で /graphql に POST (切れていたら 1 回だけ張り直す)"""
+    headers = {
+        "Authorization": f"bearer {token}",
+        "Content-Type": "application/json",
+        "User-Agent": "fgp-permission-probe",
+    }
+    for attempt in range(2):
+        conn = _get_connection()
+        try:
+            conn.request("POST", "/graphql", body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (ConnectionError, HTTPException):
+            _close_connection()
+            if attempt == 0:
+                continue
+            raise
+        if response.will_close:
+            _close_connection()
+        return response.status, response.headers, data
+    raise AssertionError("unreachable")
+
+
+# 一時的なエラー (429 / 5xx / secondary rate limit / 通信エラー) のリトライ設定
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+
+class GraphQLTransportError(Exception):
+    """リトライしても GraphQL のレスポンスが得られなかった (権限の判定には使えない)"""
+
+
+def _is_transient(status: int, headers: HTTPMessage, data: bytes) -> bool:
+    """リトライすべきレスポンスか (GraphQL の FORBIDDEN は 200 で返るので対象外)"""
+    if status == 429 or status >= 500:
+        return True
+    # primary / secondary rate limit は 403 で返る
+    return status == 403 and (
+        "Retry-After" in headers
+        or headers.get("X-RateLimit-Remaining") == "0"
+        or b"secondary rate limit" in data.lower()
     )
 
+
+def _retry_delay(attempt: int, retry_after: str | None = None) -> float:
+    """待ち時間 (Retry-After があれば従う。なければ指数バックオフ ±20% のジッター)"""
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    delay = min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def run_graphql_query(query: str, variables: dict[str, str] | None = None) -> dict[str, Any]:
+    """
+    GraphQL クエリを実行
+
+    トークンが取れれば api.github.com に直接 POST する (接続は使い回す)。
+    取れなければ gh api graphql にフォールバックする。
+    一時的なエラーは最大 MAX_ATTEMPTS 回まで待ってリトライする。
+
+    Raises:
+        GraphQLTransportError: リトライしても通信エラーや一時的なエラーが続いた場合
+    """
+    token = get_token()
+    if token is None:
+        return run_graphql_query_gh(query, variables)
+
+    body = {"query": query}
+    if variables:
+        body["variables"] = variables
+    payload = json_dumps(body)
+
+    for attempt in range(MAX_ATTEMPTS):
+        last_attempt = attempt == MAX_ATTEMPTS - 1
+        try:
+            status, headers, data = _post_graphql(payload, token)
+        except (OSError, HTTPException) as e:
+            _close_connection()
+            if last_attempt:
+                raise GraphQLTransportError(f"{e} (after {MAX_ATTEMPTS} attempts)") from e
+            time.sleep(_retry_delay(attempt))
+            continue
+
+        if _is_transient(status, headers, data):
+            if last_attempt:
+                raise GraphQLTransportError(f"HTTP {status} (after {MAX_ATTEMPTS} attempts)")
+            time.sleep(_retry_delay(attempt, headers.get("Retry-After")))
+            continue
+        break
+
+    try:
+        return json_loads(data)
+    except json.JSONDecodeError as e:
+        body = data.decode("utf-8", errors="replace")[:100]
+        raise GraphQLTransportError(f"HTTP {status}: non-JSON response: {body}") from e
+
+
+def run_graphql_query_gh(query: str, variables: dict[str, str] | None = None) -> dict[str, Any]:
+    """
+    gh api graphql を使ってクエリを実行
+
+    Raises:
+        GraphQLTransportError: gh の出力が JSON でなかった場合 (通信エラー等)
+    """
+    args = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for name, value in (variables or {}).items():
+        args += ["-f", f"{name}={value}"]
+    # 出力は bytes のまま JSON パーサーに渡す (文字列へのデコードを挟まない)
+    result = subprocess.run(args, capture_output=True)
+
     try:
-        return json.loads(result.stdout or result.stderr)
-    except json.JSONDecodeError:
-        return {"raw_error": result.stderr, "raw_stdout": result.stdout}
+        return json_loads(result.stdout or result.stderr)
+    except json.JSONDecodeError as e:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise GraphQLTransportError(f"gh api graphql failed: {stderr[:100]}") from e
+
+
+# introspection 結果のキャッシュ (スキーマはめったに変わらないので 1 日使い回す)
+SCHEMA_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "permission_probe" / "repository_fields.v1.json"
+)
+SCHEMA_CACHE_TTL = 24 * 60 * 60
+
+
+def get_repository_fields(refresh: bool = False) -> list[dict[str, Any]]:
+    """
+    Repository タイプの全フィールドを取得
+
+    キャッシュが新しければそれを使い、なければ introspection して保存する。
+    refresh=True ならキャッシュを無視する。
+    """
+    if not refresh:
+        try:
+            if time.time() - SCHEMA_CACHE_PATH.stat().st_mtime < SCHEMA_CACHE_TTL:
+                return json_loads(SCHEMA_CACHE_PATH.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    fields = fetch_repository_fields()
+
+    # 取得に失敗した (空の) 結果はキャッシュしない
+    if fields:
+        try:
+            SCHEMA_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = SCHEMA_CACHE_PATH.with_suffix(".tmp")
+            tmp_path.write_bytes(json_dumps(fields))
+            tmp_path.replace(SCHEMA_CACHE_PATH)
+        except OSError as e:
+            print(f"Warning: could not write schema cache: {e}", file=sys.stderr)
+
+    return fields
 
 
-def get_repository_fields() -> list[dict[str, Any]]:
+def fetch_repository_fields() -> list[dict[str, Any]]:
     """Repository タイプの全フィールドを introspection で取得"""
     query = """
     {
@@ -72,53 +311,74 @@ def get_repository_fields() -> list[dict[str, Any]]:
     return result.get("data", {}).get("__type", {}).get("fields", [])
 
 
-def has_required_args(field: dict[str, Any]) -> bool:
-    """フィールドに必須引数があるかどうか"""
-    for arg in field.get("args", []):
-        arg_type = arg.get("type", {})
-        if arg_type.get("kind") == "NON_NULL":
-            return True
-    return False
+@dataclass(slots=True)
+class FieldMeta:
+    """introspection 結果から 1 回だけ読み取ったフィールドの情報"""
+    name: str
+    type_name: str       # NON_NULL / LIST を剥がした型名
+    type_kind: str       # NON_NULL / LIST を剥がした kind
+    required_args: bool  # 必須引数があるか
+    is_connection: bool
+    is_list: bool        # リスト型か (NON_NULL の内側も含む)
 
 
-def get_type_name(field_type: dict[str, Any]) -> str:
-    """フィールドの型名を取得"""
-    if field_type.get("name"):
-        return field_type["name"]
-    if field_type.get("ofType"):
-        return get_type_name(field_type["ofType"])
-    return ""
+def analyze_field(field: dict[str, Any]) -> FieldMeta:
+    """フィールドの型を 1 回たどって FieldMeta を作る"""
+    field_type = field.get("type", {})
 
+    # 型名は名前のある最初の型、kind は NON_NULL / LIST を剥がした型のもの
+    type_name = ""
+    type_kind = None
+    t = field_type
+    while t:
+        if not type_name and t.get("name"):
+            type_name = t["name"]
+        if type_kind is None:
+            kind = t.get("kind")
+            if not (kind in ("NON_NULL", "LIST") and t.get("ofType")):
+                type_kind = kind or ""
+        if type_name and type_kind is not None:
+            break
+        t = t.get("ofType")
+
+    outer_kind = field_type.get("kind")
+    is_list = outer_kind == "LIST" or (
+        outer_kind == "NON_NULL" and field_type.get("ofType", {}).get("kind") == "LIST"
+    )
 
-def get_type_kind(field_type: dict[str, Any]) -> str:
-    """フィールドの型の kind を取得 (NON_NULL, LIST を剥がす)"""
-    kind = field_type.get("kind")
-    if kind in ("NON_NULL", "LIST") and field_type.get("ofType"):
-        return get_type_kind(field_type["ofType"])
-    return kind or ""
+    return FieldMeta(
+        name=field["name"],
+        type_name=type_name,
+        type_kind=type_kind or "",
+        required_args=any(
+            arg.get("type", {}).get("kind") == "NON_NULL" for arg in field.get("args", [])
+        ),
+        is_connection=type_name.endswith("Connection"),
+        is_list=is_list,
+    )
 
 
 # 必須引数があるフィールドの手動指定
-# (field_name, query_fragment)
-MANUAL_FIELDS = [
-    ("discussion", "discussion(number: 518) { title }"),
-    ("issue", "issue(number: 1) { title }"),
-    ("pullRequest", "pullRequest(number: 1) { title }"),
-    ("ref", 'ref(qualifiedName: "refs/heads/main") { name }'),
-    ("refs", 'refs(first: 1, refPrefix: "refs/heads/") { nodes { name } }'),
-    ("label", 'label(name: "bug") { name }'),
-    ("milestone", "milestone(number: 1) { title }"),
-    ("environment", 'environment(name: "dev") { name }'),
-    ("release", "release(tagName: \"v1.0.0\") { name }"),
-    ("vulnerabilityAlert", "vulnerabilityAlert(number: 1) { id }"),
-    ("discussionCategory", 'discussionCategory(slug: "general") { name }'),
-    ("issueOrPullRequest", "issueOrPullRequest(number: 1) { __typename }"),
-    ("projectV2", "projectV2(number: 1) { title }"),
-    ("ruleset", "ruleset(databaseId: 1) { name }"),
-    ("issueType", 'issueType(name: "bug") { name }'),
-    ("repositoryCustomPropertyValue", 'repositoryCustomPropertyValue(name: "test") { name }'),
-    ("suggestedActors", 'suggestedActors(first: 1, capabilities: [CAN_BE_ASSIGNED]) { nodes { login } }'),
-]
+# field_name -> query_fragment
+MANUAL_FIELDS: dict[str, str] = {
+    "discussion": "discussion(number: 518) { title }",
+    "issue": "issue(number: 1) { title }",
+    "pullRequest": "pullRequest(number: 1) { title }",
+    "ref": 'ref(qualifiedName: "refs/heads/main") { name }',
+    "refs": 'refs(first: 1, refPrefix: "refs/heads/") { nodes { name } }',
+    "label": 'label(name: "bug") { name }',
+    "milestone": "milestone(number: 1) { title }",
+    "environment": 'environment(name: "dev") { name }',
+    "release": "release(tagName: \"v1.0.0\") { name }",
+    "vulnerabilityAlert": "vulnerabilityAlert(number: 1) { id }",
+    "discussionCategory": 'discussionCategory(slug: "general") { name }',
+    "issueOrPullRequest": "issueOrPullRequest(number: 1) { __typename }",
+    "projectV2": "projectV2(number: 1) { title }",
+    "ruleset": "ruleset(databaseId: 1) { name }",
+    "issueType": 'issueType(name: "bug") { name }',
+    "repositoryCustomPropertyValue": 'repositoryCustomPropertyValue(name: "test") { name }',
+    "suggestedActors": 'suggestedActors(first: 1, capabilities: [CAN_BE_ASSIGNED]) { nodes { login } }',
+}
 
 
 # 特定の型に対するサブフィールド選択
@@ -163,19 +423,18 @@ TYPE_SELECTIONS = {
 }
 
 
-def build_query_fragment(field: dict[str, Any]) -> str | None:
+def build_query_fragment(meta: FieldMeta) -> str | None:
     """フィールドに対するクエリフラグメントを生成"""
-    name = field["name"]
-    field_type = field.get("type", {})
+    name = meta.name
 
-    if has_required_args(field):
+    if meta.required_args:
         return None
 
-    type_name = get_type_name(field_type)
-    type_kind = get_type_kind(field_type)
+    type_name = meta.type_name
+    type_kind = meta.type_kind
 
     # Connection 型
-    if type_name.endswith("Connection"):
+    if meta.is_connection:
         inner_type = type_name.replace("Connection", "")
         selection = TYPE_SELECTIONS.get(inner_type, "id")
         # id がないかもしれないので __typename も試す
@@ -188,10 +447,7 @@ def build_query_fragment(field: dict[str, Any]) -> str | None:
         return name
 
     # リスト型 (Connection じゃない)
-    if field_type.get("kind") == "LIST" or (
-        field_type.get("kind") == "NON_NULL" and
-        field_type.get("ofType", {}).get("kind") == "LIST"
-    ):
+    if meta.is_list:
         selection = TYPE_SELECTIONS.get(type_name, "__typename")
         return f"{name} {{ {selection} }}"
 
@@ -204,17 +460,32 @@ def build_query_fragment(field: dict[str, Any]) -> str | None:
     return name
 
 
+# 調査用クエリの雛形。owner / repo は変数で渡すので、フィールドの組が同じなら
+# クエリ文字列も同じになる (サーバー側でパース結果を使い回せる)
+PROBE_QUERY = "query Probe($owner: String!, $name: String!) { repository(owner: $owner, name: $name) { %s } }"
+
+
+def is_graphql_response(result: dict[str, Any]) -> bool:
+    """GraphQL のレスポンスか (401 の {"message": ...} 等は違う)"""
+    return "data" in result or "errors" in result
+
+
+def request_failure(result: dict[str, Any]) -> dict[str, Any]:
+    """GraphQL 以前に失敗したリクエストの結果 (権限の有無はわからない)"""
+    return {
+        "accessible": False,
+        "reason": "exception",
+        "error": str(result.get("message", result))[:100],
+    }
+
+
 def probe_field(owner: str, repo: str, field_name: str, query_fragment: str) -> dict[str, Any]:
     """特定のフィールドにアクセスできるか調査"""
-    query = f"""
-    query {{
-      repository(owner: "{owner}", name: "{repo}") {{
-        {query_fragment}
-      }}
-    }}
-    """
+    query = PROBE_QUERY % query_fragment
+    result = run_graphql_query(query, {"owner": owner, "name": repo})
 
-    result = run_graphql_query(query)
+    if not is_graphql_response(result):
+        return request_failure(result)
 
     # 結果を解析
     if "errors" in result:
@@ -258,6 +529,98 @@ def probe_field(owner: str, repo: str, field_name: str, query_fragment: str) ->
     }
 
 
+# 1 リクエストにまとめるフィールド数
+BATCH_SIZE = 50
+
+# 同時に投げるリクエスト数のデフォルト
+# (GitHub は大量の同時リクエストを secondary rate limit で弾くので控えめに)
+DEFAULT_CONCURRENCY = 4
+
+
+def build_batched_query(probes: list[tuple[str, str]]) -> tuple[str, dict[str, str]]:
+    """
+    複数フィールドを alias (f0, f1, ...) で 1 つのクエリにまとめる
+
+    Returns:
+        (query, alias -> field_name)
+    """
+    aliases = {}
+    selections = []
+    for i, (field_name, query_fragment) in enumerate(probes):
+        alias = f"f{i}"
+        aliases[alias] = field_name
+        selections.append(f"{alias}: {query_fragment}")
+
+    return PROBE_QUERY % " ".join(selections), aliases
+
+
+def probe_batch(owner: str, repo: str, probes: list[tuple[str, str]]) -> dict[str, dict[str, Any]]:
+    """
+    複数フィールドを 1 リクエストで調査
+
+    FORBIDDEN は実行時エラーなので、他の alias のデータは返ってくる (部分的成功)。
+    エラーの path からどの alias が弾かれたかを判定する。
+    クエリ自体が検証で落ちた場合 (path のないエラー) や repository が null の場合は
+    1 フィールドずつ probe_field にフォールバックする。
+    GraphQL のレスポンスでなければ (認証エラー等) バッチ全体を失敗とする。
+    """
+    query, aliases = build_batched_query(probes)
+    result = run_graphql_query(query, {"owner": owner, "name": repo})
+
+    if not is_graphql_response(result):
+        failure = request_failure(result)
+        return {field_name: dict(failure) for field_name, _ in probes}
+
+    errors = result.get("errors", [])
+    data = (result.get("data") or {}).get("repository")
+    errors_by_alias: dict[str, list[dict[str, Any]]] = {}
+    for error in errors:
+        path = error.get("path") or []
+        if len(path) < 2 or path[1] not in aliases:
+            data = None  # alias に紐付かないエラー
+            break
+        errors_by_alias.setdefault(path[1], []).append(error)
+
+    if data is None:
+        return {
+            field_name: probe_field(owner, repo, field_name, query_fragment)
+            for field_name, query_fragment in probes
+        }
+
+    results = {}
+    for alias, field_name in aliases.items():
+        alias_errors = errors_by_alias.get(alias)
+        if not alias_errors:
+            results[field_name] = {"accessible": True}
+        elif data.get(alias) is not None:
+            # エラーがあっても部分的にデータが取れる場合がある
+            results[field_name] = {"accessible": True, "partial_error": True}
+        elif any(e.get("type") == "FORBIDDEN" for e in alias_errors):
+            results[field_name] = {
+                "accessible": False,
+                "reason": "forbidden",
+                "error": alias_errors[0].get("message", "")[:100],
+            }
+        else:
+            results[field_name] = {
+                "accessible": True,  # 権限的には OK、クエリの書き方の問題
+                "query_error": True,
+                "error": alias_errors[0].get("message", "")[:100],
+            }
+    return results
+
+
+def format_result(result: dict[str, Any]) -> str:
+    """調査結果の表示用文字列"""
+    if result.get("accessible"):
+        if result.get("query_error"):
+            return "~ (query error, but not forbidden)"
+        return "✓"
+    if result.get("reason") == "exception":
+        return f"ERROR: {result['error']}"
+    return "✗ FORBIDDEN"
+
+
 def main():
     import argparse
 
@@ -265,13 +628,25 @@ def main():
     parser.add_argument("--repo", required=True, help="Repository in owner/repo format")
     parser.add_argument("--output", "-o", help="Output JSON file (default: stdout)")
     parser.add_argument("--note", help="Note about the PAT permissions (for documentation)")
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Number of queries in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--refresh-schema", action="store_true",
+        help=f"Ignore the cached introspection result ({SCHEMA_CACHE_PATH})",
+    )
 
     args = parser.parse_args()
 
     owner, repo = args.repo.split("/")
 
     print("Fetching Repository schema via introspection...", file=sys.stderr)
-    all_fields = get_repository_fields()
+    try:
+        all_fields = get_repository_fields(refresh=args.refresh_schema)
+    except GraphQLTransportError as e:
+        print(f"Error: Could not fetch the schema: {e}", file=sys.stderr)
+        sys.exit(1)
     print(f"Found {len(all_fields)} fields", file=sys.stderr)
 
     results = {
@@ -283,18 +658,16 @@ def main():
         "skipped_fields": [],
     }
 
-    # 手動フィールドの名前セット
-    manual_field_names = {name for name, _ in MANUAL_FIELDS}
+    # 調査するフィールドを集める (手動指定があるフィールドは手動のクエリを使う)
+    probes = []
+    schema_names = set()
+    for meta in map(analyze_field, all_fields):
+        field_name = meta.name
+        schema_names.add(field_name)
 
-    probed = 0
-    for field in all_fields:
-        field_name = field["name"]
-
-        # 手動指定があるフィールドは後で処理
-        if field_name in manual_field_names:
-            continue
-
-        query_fragment = build_query_fragment(field)
+        query_fragment = MANUAL_FIELDS.get(field_name)
+        if query_fragment is None:
+            query_fragment = build_query_fragment(meta)
 
         if query_fragment is None:
             results["skipped_fields"].append({
@@ -303,77 +676,95 @@ def main():
             })
             continue
 
-        probed += 1
-        print(f"  [{probed}] {field_name}...", file=sys.stderr, end=" ", flush=True)
+        probes.append((field_name, query_fragment))
 
-        try:
-            result = probe_field(owner, repo, field_name, query_fragment)
-            results["fields"][field_name] = result
-
-            if result.get("accessible"):
-                if result.get("query_error"):
-                    print("~ (query error, but not forbidden)", file=sys.stderr)
-                else:
-                    print("✓", file=sys.stderr)
+    # 手動指定でも今のスキーマにないフィールドは投げない
+    for field_name in MANUAL_FIELDS:
+        if field_name not in schema_names:
+            results["skipped_fields"].append({
+                "name": field_name,
+                "reason": "not in current schema",
+            })
+
+    # BATCH_SIZE 件ずつ 1 リクエストにまとめ、並列に調査
+    batches = [probes[i:i + BATCH_SIZE] for i in range(0, len(probes), BATCH_SIZE)]
+    field_results: dict[str, dict[str, Any]] = {}
+    probed = 0
+    forbidden_so_far = 0
+    progress = (
+        tqdm(total=len(probes), file=sys.stderr, desc="Probing", unit="field")
+        if tqdm is not None else None
+    )
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        futures = {
+            executor.submit(probe_batch, owner, repo, batch): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                batch_results = future.result()
+            except Exception as e:
+                batch_results = {
+                    field_name: {
+                        "accessible": False,
+                        "reason": "exception",
+                        "error": str(e),
+                    }
+                    for field_name, _ in batch
+                }
+
+            # 進捗は終わったバッチから、バッチ単位でまとめて表示する
+            lines = []
+            for field_name, _ in batch:
+                probed += 1
+                result = batch_results[field_name]
+                field_results[field_name] = result
+                if result.get("reason") == "forbidden":
+                    forbidden_so_far += 1
+                lines.append(f"  [{probed}] {field_name}... {format_result(result)}\n")
+
+            if progress is not None:
+                progress.set_postfix_str(f"FORBIDDEN: {forbidden_so_far}", refresh=False)
+                progress.update(len(batch))
             else:
-                print("✗ FORBIDDEN", file=sys.stderr)
-        except Exception as e:
-            results["fields"][field_name] = {
-                "accessible": False,
-                "reason": "exception",
-                "error": str(e),
-            }
-            print(f"ERROR: {e}", file=sys.stderr)
+                sys.stderr.write("".join(lines))
+                sys.stderr.flush()
 
-    # 手動指定フィールドを処理
-    print("\n  [Manual fields]", file=sys.stderr)
-    for field_name, query_fragment in MANUAL_FIELDS:
-        probed += 1
-        print(f"  [{probed}] {field_name}...", file=sys.stderr, end=" ", flush=True)
+    if progress is not None:
+        progress.close()
 
-        try:
-            result = probe_field(owner, repo, field_name, query_fragment)
-            results["fields"][field_name] = result
-
-            if result.get("accessible"):
-                if result.get("query_error"):
-                    print("~ (query error, but not forbidden)", file=sys.stderr)
-                else:
-                    print("✓", file=sys.stderr)
-            else:
-                print("✗ FORBIDDEN", file=sys.stderr)
-        except Exception as e:
-            results["fields"][field_name] = {
-                "accessible": False,
-                "reason": "exception",
-                "error": str(e),
-            }
-            print(f"ERROR: {e}", file=sys.stderr)
+    # 出力はフィールド順に揃える
+    for field_name, _ in probes:
+        results["fields"][field_name] = field_results[field_name]
 
     # 結果を出力
-    output_json = json.dumps(results, indent=2, ensure_ascii=False)
+    output_json = json_dumps(results, indent=True)
 
     if args.output:
-        with open(args.output, "w") as f:
-            f.write(output_json)
+        Path(args.output).write_bytes(output_json)
         print(f"\nResults written to {args.output}", file=sys.stderr)
     else:
-        print(output_json)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output_json + b"\n")
+        sys.stdout.buffer.flush()
 
     # サマリー
     accessible = sum(1 for r in results["fields"].values() if r.get("accessible"))
     forbidden = sum(1 for r in results["fields"].values() if r.get("reason") == "forbidden")
     query_errors = sum(1 for r in results["fields"].values() if r.get("query_error"))
+    failed = sum(1 for r in results["fields"].values() if r.get("reason") == "exception")
     total = len(results["fields"])
     skipped = len(results["skipped_fields"])
 
     print(f"\nSummary:", file=sys.stderr)
     print(f"  Total fields in schema: {len(all_fields)}", file=sys.stderr)
     print(f"  Probed: {total}", file=sys.stderr)
-    print(f"  Skipped (require args): {skipped}", file=sys.stderr)
+    print(f"  Skipped (require args / not in schema): {skipped}", file=sys.stderr)
     print(f"  Accessible: {accessible}", file=sys.stderr)
     print(f"  FORBIDDEN: {forbidden}", file=sys.stderr)
     print(f"  Query errors (not forbidden): {query_errors}", file=sys.stderr)
+    print(f"  Request failures (unknown): {failed}", file=sys.stderr)
 
 
 if __name__ == "__main__":